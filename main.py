@@ -60,7 +60,7 @@ def main():
         return app.exec()
         
     except Exception as e:
-        logger.error(f"Application error: {e}")
+        logger.error("Application error: %s", e)
         print(f"Application error: {e}")
         return 1
     finally:
@@ -5,22 +5,36 @@ Configuration management for MP4 to MP3 Converter application.
 import json
 import os
 from pathlib import Path
-from typing import Dict, Any, Optional
+from types import MappingProxyType
+from typing import Dict, Any, Mapping, Optional
 from PyQt6.QtCore import QSettings, QObject, pyqtSignal
 
+try:
+    import orjson
+except ImportError:  # optional, falls back to the standard json module
+    orjson = None
+
 
 class Settings(QObject):
     """Application settings manager with macOS native storage."""
     
     settings_changed = pyqtSignal(str, object)  # key, value
     
+    # Key emitted by settings_changed when several settings changed at once
+    ALL_KEYS = '*'
+    
+    # Settings files are a few hundred bytes; refuse anything unreasonable
+    MAX_IMPORT_SIZE = 1024 * 1024
+    
     # Default settings
     DEFAULTS = {
         'audio_quality': '192',  # kbps: 128, 192, 320
         'output_suffix': '_converted',  # Suffix for output files
         'auto_open_folder': True,  # Auto-open output folder after conversion
         'delete_original': False,  # Delete original files after conversion
-        'max_concurrent_conversions': 4,  # Maximum concurrent conversions
+        # Maximum concurrent conversions; every conversion is an independent
+        # single-file FFmpeg process, so use the CPUs up to the dialog's limit
+        'max_concurrent_conversions': min(os.cpu_count() or 1, 8),
         'output_directory': '',  # Default output directory
         'window_geometry': '',  # Main window geometry
         'window_state': '',  # Main window state
@@ -31,6 +45,19 @@ class Settings(QObject):
         'fade_out': 0,  # Fade out duration (seconds)
     }
     
+    # Choices offered by the settings dialog; read-only, so shared safely
+    AUDIO_QUALITY_OPTIONS = MappingProxyType({
+        '128': '128 kbps - 小ファイル、標準品質',
+        '192': '192 kbps - バランスの取れた品質',
+        '320': '320 kbps - 最高品質'
+    })
+    NAMING_PATTERN_OPTIONS = MappingProxyType({
+        '{original}_converted': '元ファイル名_converted.mp3',
+        '{original}_audio': '元ファイル名_audio.mp3',
+        '{original}': '元ファイル名.mp3',
+        'converted_{original}': 'converted_元ファイル名.mp3'
+    })
+    
     def __init__(self):
         super().__init__()
         self._settings = QSettings(
@@ -38,6 +65,10 @@ class Settings(QObject):
             "MP4toMP3Converter"
         )
         self._ensure_defaults()
+        
+        # Coerced values, so reads never go back to QSettings
+        self._cache: Dict[str, Any] = {}
+        self._load_cache()
     
     def _ensure_defaults(self):
         """Ensure all default settings exist."""
@@ -45,23 +76,24 @@ class Settings(QObject):
             if not self._settings.contains(key):
                 self._settings.setValue(key, default_value)
     
-    def get(self, key: str, default: Any = None) -> Any:
+    def _load_cache(self):
+        """Read every known setting once into the in-memory cache."""
+        for key, default_value in self.DEFAULTS.items():
+            value = self._settings.value(key, default_value)
+            self._cache[key] = self._coerce(value, default_value)
+    
+    @staticmethod
+    def _coerce(value: Any, default: Any) -> Any:
         """
-        Get a setting value.
+        Convert a stored value to the type of its default.
         
         Args:
-            key (str): Setting key
-            default (Any): Default value if key doesn't exist
+            value (Any): Stored value
+            default (Any): Default value that determines the type
             
         Returns:
-            Any: Setting value
+            Any: Converted value
         """
-        if default is None:
-            default = self.DEFAULTS.get(key)
-        
-        value = self._settings.value(key, default)
-        
-        # Convert to correct type based on default
         if isinstance(default, bool) and not isinstance(value, bool):
             value = value.lower() == 'true' if isinstance(value, str) else bool(value)
         elif isinstance(default, int) and not isinstance(value, int):
@@ -77,33 +109,96 @@ class Settings(QObject):
         
         return value
     
+    def get(self, key: str, default: Any = None) -> Any:
+        """
+        Get a setting value.
+        
+        Args:
+            key (str): Setting key
+            default (Any): Default value if key doesn't exist
+            
+        Returns:
+            Any: Setting value
+        """
+        if key in self._cache:
+            return self._cache[key]
+        
+        if default is None:
+            default = self.DEFAULTS.get(key)
+        
+        return default
+    
     def set(self, key: str, value: Any) -> None:
         """
         Set a setting value.
         
+        Nothing is written or emitted when the value is unchanged.
+        
         Args:
             key (str): Setting key
             value (Any): Setting value
         """
+        value = self._coerce(value, self.DEFAULTS.get(key))
+        if key in self._cache and self._cache[key] == value:
+            return
+        
+        self._cache[key] = value
         self._settings.setValue(key, value)
         self.settings_changed.emit(key, value)
     
-    def get_audio_quality_options(self) -> Dict[str, str]:
-        """Get available audio quality options."""
-        return {
-            '128': '128 kbps - 小ファイル、標準品質',
-            '192': '192 kbps - バランスの取れた品質',
-            '320': '320 kbps - 最高品質'
-        }
-    
-    def get_naming_pattern_options(self) -> Dict[str, str]:
-        """Get available file naming pattern options."""
-        return {
-            '{original}_converted': '元ファイル名_converted.mp3',
-            '{original}_audio': '元ファイル名_audio.mp3',
-            '{original}': '元ファイル名.mp3',
-            'converted_{original}': 'converted_元ファイル名.mp3'
-        }
+    def get_many(self, keys) -> Dict[str, Any]:
+        """
+        Get several setting values at once.
+        
+        Args:
+            keys (Iterable[str]): Setting keys
+            
+        Returns:
+            Dict[str, Any]: Setting values by key, defaults for unset keys
+        """
+        cache = self._cache
+        return {key: cache[key] if key in cache else self.DEFAULTS.get(key) for key in keys}
+    
+    def set_many(self, values: Dict[str, Any]) -> bool:
+        """
+        Set several known settings, emitting a single change notification.
+        
+        Unknown keys are ignored. When anything changed, ``settings_changed``
+        is emitted once with ``ALL_KEYS`` and ``None`` so listeners reload
+        everything instead of reacting to each key.
+        
+        Args:
+            values (Dict[str, Any]): Setting values by key
+            
+        Returns:
+            bool: True if any setting changed
+        """
+        changed = False
+        for key, value in values.items():
+            if key not in self.DEFAULTS:
+                continue
+            value = self._coerce(value, self.DEFAULTS[key])
+            if self._cache.get(key) == value:
+                continue
+            self._cache[key] = value
+            self._settings.setValue(key, value)
+            changed = True
+        
+        if changed:
+            self.settings_changed.emit(self.ALL_KEYS, None)
+        return changed
+    
+    def sync(self) -> None:
+        """Write pending changes to permanent storage."""
+        self._settings.sync()
+    
+    def get_audio_quality_options(self) -> Mapping[str, str]:
+        """Get available audio quality options (read-only)."""
+        return self.AUDIO_QUALITY_OPTIONS
+    
+    def get_naming_pattern_options(self) -> Mapping[str, str]:
+        """Get available file naming pattern options (read-only)."""
+        return self.NAMING_PATTERN_OPTIONS
     
     def export_settings(self, file_path: str) -> bool:
         """
@@ -116,12 +211,13 @@ class Settings(QObject):
             bool: Success status
         """
         try:
-            settings_dict = {}
-            for key in self.DEFAULTS.keys():
-                settings_dict[key] = self.get(key)
+            settings_dict = {key: self._cache[key] for key in self.DEFAULTS}
             
-            with open(file_path, 'w', encoding='utf-8') as f:
-                json.dump(settings_dict, f, indent=2, ensure_ascii=False)
+            if orjson is not None:
+                data = orjson.dumps(settings_dict, option=orjson.OPT_INDENT_2)
+            else:
+                data = json.dumps(settings_dict, indent=2, ensure_ascii=False).encode('utf-8')
+            Path(file_path).write_bytes(data)
             
             return True
         except Exception as e:
@@ -139,12 +235,16 @@ class Settings(QObject):
             bool: Success status
         """
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                settings_dict = json.load(f)
+            path = Path(file_path)
+            if path.stat().st_size > self.MAX_IMPORT_SIZE:
+                raise ValueError(f"settings file is too large: {file_path}")
+            
+            data = path.read_bytes()
+            settings_dict = orjson.loads(data) if orjson is not None else json.loads(data)
+            if not isinstance(settings_dict, dict):
+                raise ValueError("settings file must contain a JSON object")
             
-            for key, value in settings_dict.items():
-                if key in self.DEFAULTS:
-                    self.set(key, value)
+            self.set_many(settings_dict)
             
             return True
         except Exception as e:
@@ -153,8 +253,7 @@ class Settings(QObject):
     
     def reset_to_defaults(self) -> None:
         """Reset all settings to default values."""
-        for key, default_value in self.DEFAULTS.items():
-            self.set(key, default_value)
+        self.set_many(self.DEFAULTS)
     
     def get_output_directory(self) -> str:
         """Get output directory, creating default if empty."""
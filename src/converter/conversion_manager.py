@@ -3,75 +3,159 @@ Conversion manager for handling batch MP4 to MP3 conversions.
 """
 
 import os
-import time
 import threading
-from pathlib import Path
-from typing import List, Dict, Any, Optional
-from PyQt6.QtCore import QObject, pyqtSignal, QThread, QTimer
+from concurrent.futures import ThreadPoolExecutor
+from types import MappingProxyType
+from typing import List, Dict, Any, Callable, Mapping, Optional
+from PyQt6.QtCore import QObject, QTimer, pyqtSignal, pyqtSlot, Qt
 
+from config.settings import Settings
 from converter.ffmpeg_wrapper import FFmpegWrapper
 from utils.file_manager import FileManager
-from exceptions import ConversionError, ConversionCancelledError
+from exceptions import ConversionError, ConversionCancelledError, DiskSpaceError
 
+try:
+    from send2trash import send2trash
+except ImportError:  # optional, originals are deleted permanently without it
+    send2trash = None
 
-class ConversionWorker(QThread):
-    """Worker thread for individual file conversion."""
+
+# Settings read by a batch, snapshotted once per batch by snapshot_settings
+WORKER_SETTING_KEYS = (
+    'audio_quality',
+    'preserve_metadata',
+    'volume_normalization',
+    'fade_in',
+    'fade_out',
+    'file_naming_pattern',
+    'output_suffix',
+    'delete_original',
+    'max_concurrent_conversions',
+)
+
+
+def snapshot_settings(settings: Any) -> Mapping[str, Any]:
+    """
+    Read the settings a batch needs into a read-only plain mapping.
+    
+    Must be called on the thread that owns ``settings`` (the GUI thread):
+    resolving the output directory may write the default back. The manager
+    and its workers only ever see the snapshot.
+    
+    Args:
+        settings (Any): Settings instance
+        
+    Returns:
+        Mapping[str, Any]: Snapshot, including the resolved ``output_directory``
+    """
+    snapshot = {
+        key: settings.get(key, Settings.DEFAULTS[key])
+        for key in WORKER_SETTING_KEYS
+    }
+    snapshot['output_directory'] = settings.get_output_directory()
+    return MappingProxyType(snapshot)
+
+
+def conversion_options(settings: Mapping[str, Any]) -> Dict[str, Any]:
+    """
+    Build FFmpeg conversion options from settings.
+    
+    Args:
+        settings (Mapping[str, Any]): Settings or a settings snapshot
+        
+    Returns:
+        Dict[str, Any]: Options for ``FFmpegWrapper.convert_mp4_to_mp3``
+    """
+    return {
+        'bitrate': settings.get('audio_quality', '192'),
+        'preserve_metadata': settings.get('preserve_metadata', True),
+        'volume_normalization': settings.get('volume_normalization', False),
+        'fade_in': settings.get('fade_in', 0),
+        'fade_out': settings.get('fade_out', 0),
+    }
+
+
+class ConversionWorker(QObject):
+    """
+    Converts a single file.
+    
+    ``run()`` is called synchronously on a pool thread, so this is a plain
+    QObject rather than a QThread; its signals reach the manager through
+    queued connections.
+    """
     
     progress_updated = pyqtSignal(str, int)  # file_name, progress
     conversion_completed = pyqtSignal(str, bool, str)  # file_name, success, message
     
-    def __init__(self, file_info: Dict[str, Any], settings: Any, ffmpeg_wrapper: FFmpegWrapper):
+    def __init__(self, file_info: Dict[str, Any], settings: Mapping[str, Any],
+                 ffmpeg_wrapper: FFmpegWrapper,
+                 cancel_event: Optional[threading.Event] = None,
+                 options: Optional[Mapping[str, Any]] = None,
+                 delete_file: Optional[Callable[[str], None]] = None):
+        """
+        Args:
+            file_info (Dict[str, Any]): File to convert, with the
+                ``output_filename`` assigned by the manager
+            settings (Mapping[str, Any]): Settings snapshot for the batch,
+                including the resolved ``output_directory``
+            ffmpeg_wrapper (FFmpegWrapper): Shared FFmpeg wrapper
+            cancel_event (Optional[threading.Event]): Batch cancellation flag
+            options (Optional[Mapping[str, Any]]): Conversion options shared
+                by the batch; built from ``settings`` when omitted
+            delete_file (Optional[Callable[[str], None]]): Called with the
+                input path when ``delete_original`` is set; the file is
+                removed right away when omitted
+        """
         super().__init__()
         self.file_info = file_info
         self.settings = settings
         self.ffmpeg_wrapper = ffmpeg_wrapper
+        self.cancel_event = cancel_event or threading.Event()
+        self.options = options
+        self.delete_file = delete_file
         self.cancelled = False
     
+    def is_cancelled(self) -> bool:
+        """Check if this worker or its whole batch was cancelled."""
+        return self.cancelled or self.cancel_event.is_set()
+    
+    def _file_name(self) -> str:
+        """Get the name reported in signals for this file."""
+        return self.file_info.get('output_name', self.file_info.get('name', 'Unknown File'))
+    
     def run(self):
         """Run the conversion."""
         try:
-            if self.cancelled:
+            if self.is_cancelled():
+                self.conversion_completed.emit(self._file_name(), False, "キャンセルされました")
                 return
             
             input_path = self.file_info['input_path']
-            output_name = self.file_info['output_name']
-            
-            # Generate output filename
-            naming_pattern = self.settings.get('file_naming_pattern')
-            suffix = self.settings.get('output_suffix', '_converted')
-            
-            file_manager = FileManager()
-            output_filename = file_manager.generate_output_filename(
-                input_path, naming_pattern, suffix
-            )
+            output_name = self._file_name()
             
             output_path = os.path.join(
-                self.settings.get_output_directory(),
-                output_filename
+                self.settings.get('output_directory'),
+                self.file_info['output_filename']
             )
             
             # Prepare conversion options
-            options = {
-                'bitrate': self.settings.get('audio_quality', '192'),
-                'preserve_metadata': self.settings.get('preserve_metadata', True),
-                'volume_normalization': self.settings.get('volume_normalization', False),
-                'fade_in': self.settings.get('fade_in', 0),
-                'fade_out': self.settings.get('fade_out', 0),
-            }
+            options = self.options
+            if options is None:
+                options = conversion_options(self.settings)
+            if 'input_stat' in self.file_info:
+                options = {**options, 'input_stat': self.file_info['input_stat']}
             
             # Progress callback
             def progress_callback(progress: int):
-                if self.cancelled:
-                    return False
                 self.progress_updated.emit(output_name, progress)
-                return True
             
-            # Perform conversion
+            # Perform conversion; FFmpeg polls is_cancelled on its own, so a
+            # cancel lands even while progress is unknown or not moving
             success = self.ffmpeg_wrapper.convert_mp4_to_mp3(
-                input_path, output_path, options, progress_callback
+                input_path, output_path, options, progress_callback, self.is_cancelled
             )
             
-            if self.cancelled:
+            if self.is_cancelled():
                 message = "キャンセルされました"
                 success = False
             elif success:
@@ -79,21 +163,22 @@ class ConversionWorker(QThread):
                 
                 # Delete original file if enabled
                 if self.settings.get('delete_original', False):
-                    try:
-                        os.remove(input_path)
-                    except OSError:
-                        pass  # Ignore deletion errors
+                    if self.delete_file is not None:
+                        self.delete_file(input_path)
+                    else:
+                        try:
+                            os.remove(input_path)
+                        except OSError:
+                            pass  # Ignore deletion errors
             else:
                 message = "変換失敗"
             
             self.conversion_completed.emit(output_name, success, message)
             
         except ConversionCancelledError:
-            file_name = self.file_info.get('name', 'Unknown File')
-            self.conversion_completed.emit(file_name, False, "キャンセルされました")
+            self.conversion_completed.emit(self._file_name(), False, "キャンセルされました")
         except Exception as e:
-            file_name = self.file_info.get('name', 'Unknown File')
-            self.conversion_completed.emit(file_name, False, str(e))
+            self.conversion_completed.emit(self._file_name(), False, str(e))
     
     def cancel(self):
         """Cancel the conversion."""
@@ -109,14 +194,37 @@ class ConversionManager(QObject):
     all_conversions_completed = pyqtSignal(int, int)  # success_count, total_count
     conversion_error = pyqtSignal(str)  # error_message
     
-    def __init__(self, settings: Any):
+    # Completion of a file whose worker could not run, from a pool thread
+    _task_failed = pyqtSignal(str, bool, str)  # file_name, success, message
+    
+    # Maximum rate of conversion_progress emissions
+    PROGRESS_FLUSH_INTERVAL_MS = 100
+    
+    def __init__(self):
         super().__init__()
-        self.settings = settings
         self.ffmpeg_wrapper = FFmpegWrapper()
         self.file_manager = FileManager()
         
         self.converting = False
         self.cancelled = False
+        self._cancel_event = threading.Event()
+        self._executor = None
+        self._settings_snapshot: Mapping[str, Any] = MappingProxyType({})
+        self._conversion_options: Mapping[str, Any] = MappingProxyType({})
+        
+        # Latest progress per file, emitted by _progress_timer
+        self._pending_progress: Dict[str, int] = {}
+        self._progress_timer = QTimer(self)
+        self._progress_timer.setSingleShot(True)
+        self._progress_timer.setInterval(self.PROGRESS_FLUSH_INTERVAL_MS)
+        self._progress_timer.timeout.connect(self._flush_progress)
+        
+        self._task_failed.connect(self._on_worker_completed, Qt.ConnectionType.QueuedConnection)
+        
+        # Guards workers and the counters, which pool threads also touch
+        self._lock = threading.Lock()
+        self._pending_deletions: List[str] = []
+        self._delete_thread: Optional[threading.Thread] = None
         self.workers = []
         self.completed_count = 0
         self.success_count = 0
@@ -130,12 +238,19 @@ class ConversionManager(QObject):
         self.ffmpeg_wrapper.set_logger(logger)
         self.file_manager.set_logger(logger)
     
-    def start_conversion(self, files_to_convert: List[Dict[str, Any]]):
+    @pyqtSlot(list, object)
+    def start_conversion(self, files_to_convert: List[Dict[str, Any]],
+                         settings_snapshot: Mapping[str, Any]):
         """
         Start batch conversion of files.
         
+        Called on this object's thread; ``cancel_conversion`` and the
+        status getters may be called from any thread.
+        
         Args:
             files_to_convert (List[Dict[str, Any]]): List of files to convert
+            settings_snapshot (Mapping[str, Any]): Result of ``snapshot_settings``,
+                taken on the thread that owns the settings
         """
         if self.converting:
             return
@@ -144,103 +259,234 @@ class ConversionManager(QObject):
             self.conversion_error.emit("変換するファイルがありません")
             return
         
+        self._settings_snapshot = settings_snapshot
+        
+        # Stat every input once; workers and FFmpegWrapper reuse the result
+        files_to_convert = self.file_manager.stat_inputs(files_to_convert)
+        
+        # One disk space check for the whole batch instead of one per file
+        try:
+            self._precheck_disk_space(files_to_convert)
+        except DiskSpaceError as e:
+            if self.logger:
+                self.logger.error("Batch rejected: %s", e)
+            self.conversion_error.emit(e.user_message)
+            return
+        
         self.converting = True
         self.cancelled = False
+        self._cancel_event = threading.Event()
         self.workers = []
+        self._pending_progress = {}
         self.completed_count = 0
         self.success_count = 0
         self.total_files = len(files_to_convert)
         
+        # Options are constant for the batch: compile the FFmpeg arguments once
+        options = conversion_options(self._settings_snapshot)
+        options['command_template'] = self.ffmpeg_wrapper.compile_command_template(options)
+        options['disk_space_checked'] = True
+        self._conversion_options = MappingProxyType(options)
+        
+        # Name every output up front so collisions are resolved in one pass
+        output_namer = self.file_manager.compile_output_namer(
+            self._settings_snapshot['file_naming_pattern'],
+            self._settings_snapshot['output_suffix']
+        )
+        files_to_convert = self.file_manager.assign_output_filenames(
+            files_to_convert, self._settings_snapshot['output_directory'], output_namer
+        )
+        
         self.conversion_started.emit(self.total_files)
         
         if self.logger:
-            self.logger.info(f"Starting conversion of {self.total_files} files")
+            self.logger.info("Starting conversion of %s files", self.total_files)
         
         # Start conversion with limited concurrency
-        max_concurrent = self.settings.get('max_concurrent_conversions', 4)
+        max_concurrent = self._get_max_concurrent(self.total_files)
         self._process_files(files_to_convert, max_concurrent)
     
+    def _precheck_disk_space(self, files_to_convert: List[Dict[str, Any]]) -> None:
+        """
+        Check the output directory can hold the estimated output of the batch.
+        
+        Args:
+            files_to_convert (List[Dict[str, Any]]): List of files to convert
+            
+        Raises:
+            DiskSpaceError: If the batch does not fit
+        """
+        total_estimated = 0
+        for file_info in files_to_convert:
+            input_stat = file_info.get('input_stat')
+            if input_stat is None:
+                continue  # Reported by the worker when it gets to the file
+            total_estimated += self.ffmpeg_wrapper.estimate_output_size(input_stat.st_size)
+        
+        self.ffmpeg_wrapper.precheck_batch(
+            self._settings_snapshot['output_directory'], total_estimated
+        )
+    
+    def _get_max_concurrent(self, file_count: int) -> int:
+        """Get the number of FFmpeg processes to run at once."""
+        max_concurrent = self._settings_snapshot['max_concurrent_conversions']
+        return max(1, min(max_concurrent, file_count))
+    
     def _process_files(self, files_to_convert: List[Dict[str, Any]], max_concurrent: int):
-        """Process files with limited concurrency."""
-        import queue
-        import threading
+        """
+        Queue files on a thread pool with limited concurrency.
         
-        file_queue = queue.Queue()
+        Returns immediately; completion is reported through the worker
+        signals, which are delivered on this object's thread.
+        """
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_concurrent,
+            thread_name_prefix="ffmpeg-worker"
+        )
+        # Bound now: a task queued before a cancel must keep seeing its own
+        # batch's event and settings, not those of a later batch
+        cancel_event = self._cancel_event
+        settings_snapshot = self._settings_snapshot
+        options = self._conversion_options
         for file_info in files_to_convert:
-            file_queue.put(file_info)
-        
-        def worker_thread():
-            while not file_queue.empty() and not self.cancelled:
-                try:
-                    file_info = file_queue.get_nowait()
-                    self._convert_single_file(file_info)
-                    file_queue.task_done()
-                except queue.Empty:
-                    break
-        
-        # Start worker threads
-        threads = []
-        for _ in range(min(max_concurrent, len(files_to_convert))):
-            thread = threading.Thread(target=worker_thread)
-            thread.start()
-            threads.append(thread)
-        
-        # Wait for all threads to complete
-        for thread in threads:
-            thread.join()
+            self._executor.submit(
+                self._convert_single_file, file_info, cancel_event, settings_snapshot, options
+            )
         
-        # Check if all conversions are complete
-        self._check_all_conversions_complete()
+        # Workers exit once the queue drains; nothing waits for them here
+        self._executor.shutdown(wait=False)
     
-    def _convert_single_file(self, file_info: Dict[str, Any]):
-        """Convert a single file."""
-        if self.cancelled:
-            return
+    def _convert_single_file(self, file_info: Dict[str, Any], cancel_event: threading.Event,
+                             settings_snapshot: Mapping[str, Any],
+                             options: Mapping[str, Any]):
+        """
+        Convert a single file.
         
+        Args:
+            file_info (Dict[str, Any]): File to convert
+            cancel_event (threading.Event): Cancellation flag of the file's batch
+            settings_snapshot (Mapping[str, Any]): Settings snapshot of the batch
+            options (Mapping[str, Any]): Conversion options of the batch
+        """
         try:
-            # Create worker thread for this file
-            worker = ConversionWorker(file_info, self.settings, self.ffmpeg_wrapper)
+            # Create the worker for this file
+            worker = ConversionWorker(
+                file_info, settings_snapshot, self.ffmpeg_wrapper,
+                cancel_event, options, self._queue_deletion
+            )
             
-            # Connect signals
-            worker.progress_updated.connect(self._on_worker_progress)
-            worker.conversion_completed.connect(self._on_worker_completed)
+            # Connect signals; queued so the slots run on this object's thread
+            worker.progress_updated.connect(
+                self._on_worker_progress, Qt.ConnectionType.QueuedConnection
+            )
+            worker.conversion_completed.connect(
+                self._on_worker_completed, Qt.ConnectionType.QueuedConnection
+            )
             
-            self.workers.append(worker)
+            with self._lock:
+                self.workers.append(worker)
             
-            # Run conversion (blocking in this thread)
-            worker.run()
+            # Run conversion (blocking in this pool thread)
+            try:
+                worker.run()
+            finally:
+                with self._lock:
+                    self.workers.remove(worker)
             
         except Exception as e:
-            if self.logger:
-                file_name = file_info.get('name', 'Unknown File')
-                self.logger.error(f"Error converting file {file_name}: {e}")
             file_name = file_info.get('name', 'Unknown File')
+            if self.logger:
+                self.logger.error("Error converting file %s: %s", file_name, e)
             self.conversion_error.emit(f"ファイル変換エラー: {file_name}")
+            # Still counted, so the batch completes
+            self._task_failed.emit(
+                file_info.get('output_name', file_name), False, str(e)
+            )
     
+    @pyqtSlot(str, int)
     def _on_worker_progress(self, file_name: str, progress: int):
-        """Handle worker progress update."""
-        self.conversion_progress.emit(file_name, progress, self.completed_count, self.total_files)
+        """
+        Handle worker progress update.
+        
+        Updates are coalesced and emitted at most every
+        ``PROGRESS_FLUSH_INTERVAL_MS`` with the latest value per file.
+        """
+        self._pending_progress[file_name] = progress
+        if not self._progress_timer.isActive():
+            self._progress_timer.start()
     
+    @pyqtSlot()
+    def _flush_progress(self):
+        """Emit the coalesced progress updates."""
+        pending = self._pending_progress
+        self._pending_progress = {}
+        for file_name, progress in pending.items():
+            self.conversion_progress.emit(file_name, progress, self.completed_count, self.total_files)
+    
+    @pyqtSlot(str, bool, str)
     def _on_worker_completed(self, file_name: str, success: bool, message: str):
         """Handle worker completion."""
-        self.completed_count += 1
-        if success:
-            self.success_count += 1
+        # Deliver the file's last progress before its completion
+        progress = self._pending_progress.pop(file_name, None)
+        if progress is not None:
+            self.conversion_progress.emit(file_name, progress, self.completed_count, self.total_files)
+        
+        with self._lock:
+            self.completed_count += 1
+            if success:
+                self.success_count += 1
         
         self.conversion_completed.emit(file_name, success, message)
         
         # Check if all conversions are complete
         self._check_all_conversions_complete()
     
+    def _queue_deletion(self, input_path: str):
+        """Queue a converted original for deletion after the batch."""
+        with self._lock:
+            self._pending_deletions.append(input_path)
+    
+    def _delete_originals(self, paths: List[str]):
+        """
+        Delete converted originals, moving them to the trash when possible.
+        
+        Runs on its own thread once the batch is complete.
+        """
+        if send2trash is None:
+            self.file_manager.delete_files(paths)
+            return
+        
+        # One summary line, as FileManager.delete_files logs
+        deleted = failed = 0
+        for path in paths:
+            try:
+                send2trash(path)
+                deleted += 1
+            except OSError:
+                failed += 1
+        
+        if self.logger:
+            self.logger.info("Deleted %d files (%d failed)", deleted, failed)
+    
     def _check_all_conversions_complete(self):
         """Check if all conversions are complete."""
         if self.completed_count >= self.total_files:
+            with self._lock:
+                paths, self._pending_deletions = self._pending_deletions, []
+                if paths:
+                    self._delete_thread = threading.Thread(
+                        target=self._delete_originals, args=(paths,),
+                        name="delete-originals", daemon=True
+                    )
+                    self._delete_thread.start()
+            
             self.converting = False
             self.all_conversions_completed.emit(self.success_count, self.total_files)
             
             if self.logger:
                 self.logger.info(
-                    f"Conversion batch completed: {self.success_count}/{self.total_files} successful"
+                    "Conversion batch completed: %s/%s successful",
+                    self.success_count, self.total_files
                 )
     
     def cancel_conversion(self):
@@ -249,15 +495,53 @@ class ConversionManager(QObject):
             return
         
         self.cancelled = True
+        self._cancel_event.set()
         
-        # Cancel all workers
-        for worker in self.workers:
+        # Running FFmpeg processes are terminated at their next progress
+        # block; queued files report themselves as cancelled
+        with self._lock:
+            workers = list(self.workers)
+        for worker in workers:
             worker.cancel()
         
         if self.logger:
             self.logger.info("Conversion cancelled by user")
         
-        self.converting = False
+        # Still converting until every queued and running file has reported
+        # in, so a new batch cannot start next to the cancelled one's tasks
+        with self._lock:
+            finished = self.completed_count >= self.total_files
+        if finished:
+            self.converting = False
+    
+    def shutdown(self):
+        """
+        Cancel the current batch and wait until all of its work has stopped.
+        
+        Called from the GUI thread before the conversion thread quits, so no
+        pool task emits on this object after it is deleted. Blocks until the
+        running FFmpeg processes have terminated and the converted originals
+        are deleted.
+        """
+        self.cancelled = True
+        self._cancel_event.set()
+        with self._lock:
+            workers = list(self.workers)
+        for worker in workers:
+            worker.cancel()
+        
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+        
+        # Completions still queued for this thread will not be delivered once
+        # it quits, so delete their originals here
+        with self._lock:
+            paths, self._pending_deletions = self._pending_deletions, []
+            delete_thread = self._delete_thread
+        if delete_thread is not None:
+            delete_thread.join()
+        if paths:
+            self._delete_originals(paths)
     
     def is_converting(self) -> bool:
         """Check if conversion is in progress."""
@@ -265,10 +549,14 @@ class ConversionManager(QObject):
     
     def get_progress(self) -> Dict[str, Any]:
         """Get current conversion progress."""
+        with self._lock:
+            completed_count = self.completed_count
+            success_count = self.success_count
+        
         return {
             'converting': self.converting,
-            'completed': self.completed_count,
+            'completed': completed_count,
             'total': self.total_files,
-            'success_count': self.success_count,
-            'progress_percentage': (self.completed_count / self.total_files * 100) if self.total_files > 0 else 0
+            'success_count': success_count,
+            'progress_percentage': (completed_count / self.total_files * 100) if self.total_files > 0 else 0
         }
@@ -2,56 +2,117 @@
 FFmpeg wrapper for MP4 to MP3 conversion.
 """
 
+import functools
+import logging
 import os
+import re
 import subprocess
 import shutil
+import threading
+import time
+from collections import deque, namedtuple
 from pathlib import Path
 from typing import Optional, Dict, Any, Callable
-from exceptions import ConversionError, FFmpegNotFoundError, DiskSpaceError
+from exceptions import (
+    ConversionError, ConversionCancelledError, FFmpegNotFoundError, DiskSpaceError
+)
+
+# "Duration: 00:01:23.45, start: ..." line of the FFmpeg input header
+_DURATION_RE = re.compile(r'Duration: (\d+):(\d+):(\d+(?:\.\d+)?)')
+
+# "Stream #0:1[0x2](und): Audio: mp3 (mp3float) (mp4a / 0x6134706D), 44100 Hz, ..."
+_AUDIO_STREAM_RE = re.compile(r'Stream #\d+:\d+\S*: Audio: (.*)')
+
+# Channel layout names FFmpeg prints in the stream description
+_CHANNEL_LAYOUTS = {'mono': 1, 'stereo': 2}
+
+# Maximum number of probe results kept per wrapper
+_PROBE_CACHE_SIZE = 256
+
+# Shared stdin for every FFmpeg child process
+_DEVNULL = os.open(os.devnull, os.O_RDWR)
+
+# Read buffer for FFmpeg output pipes
+_PIPE_BUFFER_SIZE = 1 << 20
+
+# Minimum progress change (percent) or time (seconds) between callbacks
+_PROGRESS_STEP = 2
+_PROGRESS_INTERVAL = 0.1
+
+# FFmpeg arguments shared by a batch: the MP3 encoder arguments, and those
+# that also apply when the source audio is stream-copied
+CommandTemplate = namedtuple('CommandTemplate', ['encode', 'shared'])
+
+
+@functools.lru_cache(maxsize=1)
+def find_ffmpeg() -> str:
+    """
+    Find FFmpeg binary in system PATH or bundled location.
+    
+    The result is cached for the process; a failed lookup is not cached, so
+    installing FFmpeg while the app runs is picked up on the next call.
+    
+    Returns:
+        str: Path to FFmpeg binary
+        
+    Raises:
+        FFmpegNotFoundError: If FFmpeg is not found
+    """
+    # System PATH
+    if shutil.which('ffmpeg'):
+        return 'ffmpeg'
+    
+    # Check common locations
+    possible_paths = [
+        '/usr/local/bin/ffmpeg',  # Homebrew on macOS
+        '/opt/homebrew/bin/ffmpeg',  # Homebrew on Apple Silicon
+        './ffmpeg',  # Bundled with app
+        '../ffmpeg',  # Relative to app
+    ]
+    
+    for path in possible_paths:
+        if Path(path).exists() and os.access(path, os.X_OK):
+            return path
+    
+    raise FFmpegNotFoundError(
+        "FFmpegが見つかりません。FFmpegをインストールしてください。"
+    )
 
 
 class FFmpegWrapper:
     """Wrapper for FFmpeg command-line operations."""
     
     def __init__(self):
-        self.ffmpeg_path = self._find_ffmpeg()
+        self.ffmpeg_path = find_ffmpeg()
         self.logger = None
+        self._probe_cache: Dict[tuple, Dict[str, Any]] = {}
+        # Conversion pool threads probe concurrently
+        self._probe_lock = threading.Lock()
+        self._executable: Optional[str] = None
     
     def set_logger(self, logger):
         """Set logger instance."""
         self.logger = logger
     
-    def _find_ffmpeg(self) -> str:
+    def _spawn_kwargs(self) -> Dict[str, Any]:
         """
-        Find FFmpeg binary in system PATH or bundled location.
-        
-        Returns:
-            str: Path to FFmpeg binary
-            
-        Raises:
-            FFmpegNotFoundError: If FFmpeg is not found
-        """
-        # Check common locations
-        possible_paths = [
-            'ffmpeg',  # System PATH
-            '/usr/local/bin/ffmpeg',  # Homebrew on macOS
-            '/opt/homebrew/bin/ffmpeg',  # Homebrew on Apple Silicon
-            './ffmpeg',  # Bundled with app
-            '../ffmpeg',  # Relative to app
-        ]
+        Get the subprocess arguments shared by every FFmpeg invocation.
         
-        for path in possible_paths:
-            if shutil.which(path):
-                return path
+        ``close_fds=False`` with an absolute ``executable`` lets CPython start
+        the child with ``posix_spawn`` instead of fork + exec. Our own file
+        descriptors are non-inheritable, so nothing leaks into FFmpeg.
         
-        # Check if FFmpeg exists but not in PATH
-        for path in possible_paths[1:]:  # Skip 'ffmpeg' as it's already checked
-            if Path(path).exists() and os.access(path, os.X_OK):
-                return path
+        Returns:
+            Dict[str, Any]: Keyword arguments for ``subprocess.run``/``Popen``
+        """
+        if self._executable is None:
+            self._executable = shutil.which(self.ffmpeg_path) or os.path.abspath(self.ffmpeg_path)
         
-        raise FFmpegNotFoundError(
-            "FFmpegが見つかりません。FFmpegをインストールしてください。"
-        )
+        return {
+            'executable': self._executable,
+            'stdin': _DEVNULL,
+            'close_fds': False,
+        }
     
     def get_ffmpeg_version(self) -> str:
         """
@@ -63,9 +124,11 @@ class FFmpegWrapper:
         try:
             result = subprocess.run(
                 [self.ffmpeg_path, '-version'],
-                capture_output=True,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
                 text=True,
-                timeout=5
+                timeout=5,
+                **self._spawn_kwargs()
             )
             
             if result.returncode == 0:
@@ -80,7 +143,8 @@ class FFmpegWrapper:
     
     def convert_mp4_to_mp3(self, input_path: str, output_path: str, 
                           options: Dict[str, Any] = None,
-                          progress_callback: Optional[Callable[[int], None]] = None) -> bool:
+                          progress_callback: Optional[Callable[[int], None]] = None,
+                          cancel: Optional[Callable[[], bool]] = None) -> bool:
         """
         Convert MP4 file to MP3 format.
         
@@ -89,12 +153,15 @@ class FFmpegWrapper:
             output_path (str): Output MP3 file path
             options (Dict[str, Any]): Conversion options
             progress_callback (Optional[Callable]): Progress callback function
+            cancel (Optional[Callable[[], bool]]): Returns True once the
+                conversion should stop; checked independently of progress
             
         Returns:
             bool: Success status
             
         Raises:
             ConversionError: If conversion fails
+            ConversionCancelledError: If ``cancel`` requested cancellation
             DiskSpaceError: If insufficient disk space
         """
         if options is None:
@@ -104,31 +171,47 @@ class FFmpegWrapper:
         if not input_path or input_path.strip() == '':
             raise ConversionError("入力ファイルパスが空です")
         
-        # Validate input file
-        if not Path(input_path).exists():
-            raise ConversionError(f"入力ファイルが見つかりません: {input_path}")
+        # Validate input file; batches pass the stat result taken at enqueue time
+        input_stat = options.get('input_stat')
+        if input_stat is None:
+            try:
+                input_stat = os.stat(input_path)
+            except OSError:
+                raise ConversionError(f"入力ファイルが見つかりません: {input_path}")
         
-        # Check disk space (estimate 10% of video size for audio)
-        input_size = Path(input_path).stat().st_size
-        estimated_output_size = int(input_size * 0.1)  # Rough estimate
+        # Check disk space unless the whole batch was checked up front
+        if not options.get('disk_space_checked', False):
+            output_dir = Path(output_path).parent
+            self._check_disk_space(str(output_dir), self.estimate_output_size(input_stat.st_size))
         
-        output_dir = Path(output_path).parent
-        self._check_disk_space(str(output_dir), estimated_output_size)
+        # Probe the input once; it drives progress, fade-out and stream copy
+        media_info = self._probe_input(input_path, input_stat)
+        duration = media_info.get('duration')
         
         # Build FFmpeg command
-        cmd = self._build_ffmpeg_command(input_path, output_path, options)
+        cmd = self._build_ffmpeg_command(input_path, output_path, options, media_info)
         
         if self.logger:
-            self.logger.info(f"Starting conversion: {input_path} -> {output_path}")
-            self.logger.debug(f"FFmpeg command: {' '.join(cmd)}")
+            self.logger.info("Starting conversion: %s -> %s", input_path, output_path)
+            if self.logger.isEnabledFor(logging.DEBUG):
+                self.logger.debug("FFmpeg command: %s", ' '.join(cmd))
+        
+        if cancel is not None and cancel():
+            raise ConversionCancelledError("Conversion cancelled")
         
         try:
-            # Run FFmpeg with progress monitoring
-            success = self._run_ffmpeg_with_progress(cmd, progress_callback)
+            if media_info and self._can_stream_copy(options, media_info):
+                # Copying finishes almost immediately; no progress to follow
+                success = self._run_ffmpeg(cmd)
+                if success and progress_callback:
+                    progress_callback(100)
+            else:
+                # Run FFmpeg with progress monitoring
+                success = self._run_ffmpeg_with_progress(cmd, progress_callback, duration, cancel)
             
             if success:
                 if self.logger:
-                    self.logger.info(f"Conversion completed successfully: {output_path}")
+                    self.logger.info("Conversion completed successfully: %s", output_path)
                 return True
             else:
                 raise ConversionError("FFmpeg conversion failed")
@@ -139,13 +222,17 @@ class FFmpegWrapper:
                 self.logger.error(error_msg)
             raise ConversionError(error_msg)
         
+        except ConversionCancelledError:
+            raise
+        
         except Exception as e:
             if self.logger:
-                self.logger.error(f"Conversion error: {e}")
+                self.logger.error("Conversion error: %s", e)
             raise ConversionError(f"変換エラー: {str(e)}")
     
     def _build_ffmpeg_command(self, input_path: str, output_path: str, 
-                              options: Dict[str, Any]) -> list:
+                              options: Dict[str, Any],
+                              media_info: Optional[Dict[str, Any]] = None) -> list:
         """
         Build FFmpeg command with specified options.
         
@@ -153,62 +240,131 @@ class FFmpegWrapper:
             input_path (str): Input file path
             output_path (str): Output file path
             options (Dict[str, Any]): Conversion options
+            media_info (Optional[Dict[str, Any]]): Result of ``_probe_input``;
+                probed on demand when a fade-out needs the duration
             
         Returns:
             list: FFmpeg command arguments
         """
-        cmd = [self.ffmpeg_path, '-i', input_path]
-        
-        # Audio codec
-        cmd.extend(['-acodec', 'libmp3lame'])
-        
-        # Audio bitrate
-        bitrate = options.get('bitrate', '192')
-        cmd.extend(['-ab', f'{bitrate}k'])
-        
-        # Audio channels (default to stereo)
-        channels = options.get('channels', 2)
-        cmd.extend(['-ac', str(channels)])
+        template = options.get('command_template')
+        if template is None:
+            template = self.compile_command_template(options)
         
-        # Sample rate
-        sample_rate = options.get('sample_rate', '44100')
-        cmd.extend(['-ar', sample_rate])
+        if media_info and self._can_stream_copy(options, media_info):
+            # Source audio is already MP3 as requested: copy it untouched
+            cmd = [self.ffmpeg_path, '-i', input_path, '-vn', '-c:a', 'copy']
+            cmd.extend(template.shared)
+        else:
+            cmd = [self.ffmpeg_path, '-i', input_path]
+            cmd.extend(template.encode)
+            cmd.extend(template.shared)
         
-        # Metadata options
-        if options.get('preserve_metadata', True):
-            cmd.extend(['-map_metadata', '0'])
+        # Audio filters go in one chain: FFmpeg only honours the last -af
+        filters = []
         
         # Volume normalization
         if options.get('volume_normalization', False):
-            cmd.extend(['-af', 'loudnorm'])
+            filters.append('loudnorm')
         
         # Fade in/out
         fade_in = options.get('fade_in', 0)
         fade_out = options.get('fade_out', 0)
-        if fade_in > 0 or fade_out > 0:
-            fade_filters = []
-            if fade_in > 0:
-                fade_filters.append(f"afade=t=in:st=0:d={fade_in}")
-            if fade_out > 0:
-                # Get video duration first (simplified approach)
-                duration = self._get_video_duration(input_path)
-                if duration and duration > fade_out:
-                    fade_filters.append(f"afade=t=out:st={duration-fade_out}:d={fade_out}")
-            
-            if fade_filters:
-                cmd.extend(['-af', ','.join(fade_filters)])
+        if fade_in > 0:
+            filters.append(f"afade=t=in:st=0:d={fade_in}")
+        if fade_out > 0:
+            if media_info is None:
+                media_info = self._probe_input(input_path)
+            duration = media_info.get('duration')
+            if duration and duration > fade_out:
+                filters.append(f"afade=t=out:st={duration-fade_out}:d={fade_out}")
         
-        # Overwrite output file
-        cmd.append('-y')
+        if filters:
+            cmd.extend(['-af', ','.join(filters)])
         
         # Output file
         cmd.append(output_path)
         
         return cmd
     
+    def compile_command_template(self, options: Dict[str, Any]) -> CommandTemplate:
+        """
+        Build the FFmpeg arguments that are the same for every file.
+        
+        A batch shares its options, so this is computed once and passed back
+        in as ``options['command_template']``. Only the input, audio filters
+        and output are added per file.
+        
+        Args:
+            options (Dict[str, Any]): Conversion options
+            
+        Returns:
+            CommandTemplate: Arguments between the input and the filters, as
+            the encoder arguments and the arguments every command shares
+        """
+        bitrate = options.get('bitrate', '192')
+        channels = options.get('channels', 2)
+        sample_rate = options.get('sample_rate', '44100')
+        
+        encode = (
+            '-acodec', 'libmp3lame',
+            '-ab', f'{bitrate}k',
+            '-ac', str(channels),
+            '-ar', sample_rate,
+        )
+        
+        # Files already run in parallel; one thread per FFmpeg process
+        # avoids oversubscribing the CPU with concurrent × per-process threads
+        threads = str(options.get('ffmpeg_threads', 1))
+        shared = [
+            '-threads', threads,
+            '-filter_threads', threads,
+            '-filter_complex_threads', threads,
+        ]
+        
+        # Metadata options
+        if options.get('preserve_metadata', True):
+            shared.extend(['-map_metadata', '0'])
+        
+        # Machine-readable progress on stdout instead of the stats line
+        shared.extend(['-progress', 'pipe:1', '-nostats', '-hide_banner'])
+        
+        # Overwrite output file
+        shared.append('-y')
+        
+        return CommandTemplate(encode, tuple(shared))
+    
+    def _can_stream_copy(self, options: Dict[str, Any], media_info: Dict[str, Any]) -> bool:
+        """
+        Check whether the source audio can be copied instead of re-encoded.
+        
+        Copying is only done when the source is MP3 with the requested
+        bitrate, channel count and sample rate, and no audio filter is set.
+        
+        Args:
+            options (Dict[str, Any]): Conversion options
+            media_info (Dict[str, Any]): Result of ``_probe_input``
+            
+        Returns:
+            bool: True if ``-c:a copy`` produces the requested output
+        """
+        if not options.get('allow_stream_copy', True):
+            return False
+        
+        if (options.get('volume_normalization', False)
+                or options.get('fade_in', 0) > 0
+                or options.get('fade_out', 0) > 0):
+            return False
+        
+        return (
+            media_info.get('audio_codec') == 'mp3'
+            and media_info.get('bitrate') == str(options.get('bitrate', '192'))
+            and media_info.get('channels') == int(options.get('channels', 2))
+            and media_info.get('sample_rate') == str(options.get('sample_rate', '44100'))
+        )
+    
     def _get_video_duration(self, input_path: str) -> Optional[float]:
         """
-        Get video duration using ffprobe.
+        Get video duration in seconds.
         
         Args:
             input_path (str): Input file path
@@ -216,82 +372,253 @@ class FFmpegWrapper:
         Returns:
             Optional[float]: Duration in seconds or None
         """
-        try:
-            # Try to find ffprobe
-            ffprobe_path = self.ffmpeg_path.replace('ffmpeg', 'ffprobe')
-            if not shutil.which(ffprobe_path):
-                return None
-            
-            cmd = [
-                ffprobe_path,
-                '-v', 'error',
-                '-show_entries', 'format=duration',
-                '-of', 'default=noprint_wrappers=1:nokey=1',
-                input_path
-            ]
+        return self._probe_input(input_path).get('duration')
+    
+    def _probe_input(self, input_path: str,
+                     stat: Optional[os.stat_result] = None) -> Dict[str, Any]:
+        """
+        Probe duration and first audio stream from the FFmpeg input header.
+        
+        Running ``ffmpeg -i`` without an output only opens the container and
+        prints the header, so no separate ffprobe process is needed. Results
+        are cached per (path, mtime, size).
+        
+        Args:
+            input_path (str): Input file path
+            stat (Optional[os.stat_result]): Already known stat of the input
             
+        Returns:
+            Dict[str, Any]: ``duration`` (float seconds), ``audio_codec``,
+                ``sample_rate``, ``channels`` and ``bitrate`` (kbps); keys
+                that could not be determined are missing
+        """
+        if stat is None:
+            try:
+                stat = os.stat(input_path)
+            except OSError:
+                return {}
+        
+        cache_key = (input_path, stat.st_mtime_ns, stat.st_size)
+        with self._probe_lock:
+            cached = self._probe_cache.get(cache_key)
+        if cached is not None:
+            return cached
+        
+        media_info = {}
+        try:
+            # FFmpeg exits non-zero ("At least one output file must be
+            # specified") but the header on stderr is complete by then
             result = subprocess.run(
-                cmd,
-                capture_output=True,
+                [self.ffmpeg_path, '-hide_banner', '-i', input_path],
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.PIPE,
                 text=True,
-                timeout=10
+                timeout=5,
+                **self._spawn_kwargs()
             )
             
-            if result.returncode == 0:
-                return float(result.stdout.strip())
+            match = _DURATION_RE.search(result.stderr)
+            if match:
+                hours, minutes, seconds = match.groups()
+                media_info['duration'] = int(hours) * 3600 + int(minutes) * 60 + float(seconds)
+            
+            match = _AUDIO_STREAM_RE.search(result.stderr)
+            if match:
+                media_info.update(self._parse_audio_stream(match.group(1)))
             
         except (ValueError, subprocess.TimeoutExpired, subprocess.SubprocessError):
             pass
         
-        return None
+        with self._probe_lock:
+            if len(self._probe_cache) >= _PROBE_CACHE_SIZE:
+                self._probe_cache.pop(next(iter(self._probe_cache)), None)
+            self._probe_cache[cache_key] = media_info
+        
+        return media_info
+    
+    @staticmethod
+    def _parse_audio_stream(description: str) -> Dict[str, Any]:
+        """
+        Parse an FFmpeg header audio stream description.
+        
+        Args:
+            description (str): Text after "Audio: ", e.g.
+                "mp3 (mp3float), 44100 Hz, stereo, fltp, 192 kb/s (default)"
+            
+        Returns:
+            Dict[str, Any]: Parsed audio stream properties
+        """
+        info = {'audio_codec': description.split(None, 1)[0].rstrip(',')}
+        
+        for field in description.split(', ')[1:]:
+            field = field.strip()
+            if field.endswith(' Hz'):
+                info['sample_rate'] = field[:-3]
+            elif field in _CHANNEL_LAYOUTS:
+                info['channels'] = _CHANNEL_LAYOUTS[field]
+            elif ' kb/s' in field:
+                info['bitrate'] = field.split(' kb/s', 1)[0]
+        
+        return info
     
     def _run_ffmpeg_with_progress(self, cmd: list, 
-                                  progress_callback: Optional[Callable[[int], None]]) -> bool:
+                                  progress_callback: Optional[Callable[[int], None]],
+                                  duration: Optional[float] = None,
+                                  cancel: Optional[Callable[[], bool]] = None) -> bool:
         """
         Run FFmpeg command with progress monitoring.
         
+        Progress is read from the ``-progress pipe:1`` key=value stream and
+        reported as a percentage of ``duration``. ``cancel`` is checked at the
+        end of every progress block, whether or not progress can be computed
+        or is reported, and terminates FFmpeg when it returns True.
+        
         Args:
             cmd (list): FFmpeg command
             progress_callback (Optional[Callable]): Progress callback
+            duration (Optional[float]): Input duration in seconds
+            cancel (Optional[Callable[[], bool]]): Cancellation predicate
             
         Returns:
             bool: Success status
+            
+        Raises:
+            ConversionCancelledError: If ``cancel`` requested cancellation
         """
         try:
-            # Start FFmpeg process
+            # Start FFmpeg process; stderr is folded into stdout so a chatty
+            # FFmpeg can never block on a full, unread pipe
+            # Binary with a large buffer: the stream is ASCII key=value lines,
+            # so there is no need for a text decoder or line-buffered reads
             process = subprocess.Popen(
                 cmd,
                 stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                universal_newlines=True,
-                bufsize=1
+                stderr=subprocess.STDOUT,
+                bufsize=_PIPE_BUFFER_SIZE,
+                **self._spawn_kwargs()
             )
-            
-            # Monitor progress (simplified approach)
-            # FFmpeg doesn't provide easy progress parsing, so we use time-based estimation
-            if progress_callback:
-                # Simulate progress updates
-                import time
-                for progress in range(0, 101, 5):
+        except Exception as e:
+            if self.logger:
+                self.logger.error("Error running FFmpeg: %s", e)
+            return False
+        
+        total_us = duration * 1_000_000 if duration else None
+        last_progress = -1
+        last_report = 0.0
+        error_lines = deque(maxlen=20)
+        
+        with process:
+            for line in process.stdout:
+                key, sep, value = line.strip().partition(b'=')
+                if not sep or b' ' in key:
+                    error_lines.append(line)
+                    continue
+                
+                # "progress=continue|end" closes every block
+                if key == b'progress':
+                    if cancel is not None and cancel():
+                        process.terminate()
+                        process.wait()
+                        raise ConversionCancelledError("Conversion cancelled")
+                    continue
+                
+                # out_time_ms is also in microseconds (long-standing FFmpeg quirk)
+                if key not in (b'out_time_us', b'out_time_ms'):
+                    continue
+                if not progress_callback or not total_us:
+                    continue
+                
+                try:
+                    progress = min(100, int(int(value) * 100 / total_us))
+                except ValueError:
+                    continue  # "N/A" before the first packet
+                
+                # Report at most every _PROGRESS_STEP percent or _PROGRESS_INTERVAL
+                # seconds; FFmpeg writes a progress block many times a second
+                now = time.monotonic()
+                if progress > last_progress and (
+                        progress >= last_progress + _PROGRESS_STEP
+                        or now - last_report >= _PROGRESS_INTERVAL):
+                    last_progress = progress
+                    last_report = now
                     progress_callback(progress)
-                    time.sleep(0.1)  # Simulate conversion time
             
-            # Wait for process to complete
-            stdout, stderr = process.communicate()
+            returncode = process.wait()
+        
+        if returncode == 0:
+            if progress_callback and last_progress < 100:
+                progress_callback(100)
+            return True
+        
+        if self.logger:
+            error_output = b''.join(error_lines).decode('utf-8', 'replace').strip()
+            self.logger.error("FFmpeg error: %s", error_output)
+        return False
+    
+    def _run_ffmpeg(self, cmd: list) -> bool:
+        """
+        Run FFmpeg command without progress monitoring.
+        
+        Args:
+            cmd (list): FFmpeg command
             
-            if process.returncode == 0:
-                if progress_callback:
-                    progress_callback(100)
-                return True
-            else:
-                if self.logger:
-                    self.logger.error(f"FFmpeg error: {stderr}")
-                return False
-                
+        Returns:
+            bool: Success status
+        """
+        try:
+            process = subprocess.Popen(
+                cmd,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.PIPE,
+                bufsize=_PIPE_BUFFER_SIZE,
+                **self._spawn_kwargs()
+            )
+            _, stderr = process.communicate()
         except Exception as e:
             if self.logger:
-                self.logger.error(f"Error running FFmpeg: {e}")
+                self.logger.error("Error running FFmpeg: %s", e)
             return False
+        
+        if process.returncode == 0:
+            return True
+        
+        if self.logger:
+            error_lines = stderr.decode('utf-8', 'replace').strip().splitlines()
+            error_output = '\n'.join(error_lines[-20:])
+            self.logger.error("FFmpeg error: %s", error_output)
+        return False
+    
+    @staticmethod
+    def estimate_output_size(input_size: int) -> int:
+        """
+        Estimate the MP3 size for an input file (10% of the video size).
+        
+        Args:
+            input_size (int): Input file size in bytes
+            
+        Returns:
+            int: Rough output size in bytes
+        """
+        return int(input_size * 0.1)
+    
+    def precheck_batch(self, output_dir: str, total_estimated: int) -> None:
+        """
+        Check disk space once for a whole batch sharing an output directory.
+        
+        Conversions run with ``options['disk_space_checked']`` then skip
+        their own per-file check.
+        
+        Args:
+            output_dir (str): Output directory of the batch
+            total_estimated (int): Sum of the estimated output sizes in bytes
+            
+        Raises:
+            DiskSpaceError: If the batch does not fit
+        """
+        if total_estimated <= 0:
+            return
+        
+        self._check_disk_space(output_dir, total_estimated)
     
     def _check_disk_space(self, directory: str, required_bytes: int) -> None:
         """
@@ -329,9 +656,11 @@ class FFmpegWrapper:
         try:
             result = subprocess.run(
                 [self.ffmpeg_path, '-version'],
-                capture_output=True,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
                 text=True,
-                timeout=5
+                timeout=5,
+                **self._spawn_kwargs()
             )
             
             return result.returncode == 0
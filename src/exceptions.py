@@ -4,55 +4,83 @@ Custom exceptions for MP4 to MP3 Converter application.
 
 
 class ConversionError(Exception):
-    """Base exception for conversion-related errors."""
+    """
+    Base exception for conversion-related errors.
+    
+    ``user_message`` is a class attribute, so raising costs no per-instance
+    work for it; it can still be overridden by assigning on an instance.
+    Attributes are held in ``__slots__`` so that the instance ``__dict__``
+    is only created when such an override happens.
+    """
+    __slots__ = ("error_code",)
+    
+    user_message = "変換中にエラーが発生しました"
+    
     def __init__(self, message, error_code=None):
         super().__init__(message)
         self.error_code = error_code
-        self.user_message = "変換中にエラーが発生しました"
 
 
 class FileValidationError(ConversionError):
     """Exception raised when input file validation fails."""
+    __slots__ = ("file_path",)
+    
+    user_message = "MP4形式のファイルを選択してください"
+    
     def __init__(self, message, file_path=None):
         super().__init__(message, "FILE_VALIDATION_ERROR")
         self.file_path = file_path
-        self.user_message = "MP4形式のファイルを選択してください"
 
 
 class FFmpegNotFoundError(ConversionError):
     """Exception raised when FFmpeg binary is not found."""
+    __slots__ = ()
+    
+    user_message = "FFmpegがインストールされていません"
+    
     def __init__(self, message):
         super().__init__(message, "FFMPEG_NOT_FOUND")
-        self.user_message = "FFmpegがインストールされていません"
 
 
 class DiskSpaceError(ConversionError):
     """Exception raised when there's insufficient disk space."""
+    __slots__ = ("required_space", "available_space")
+    
+    user_message = "保存先に十分な空き容量がありません"
+    
     def __init__(self, message, required_space=None, available_space=None):
         super().__init__(message, "DISK_SPACE_ERROR")
         self.required_space = required_space
         self.available_space = available_space
-        self.user_message = "保存先に十分な空き容量がありません"
 
 
 class ConversionCancelledError(ConversionError):
     """Exception raised when conversion is cancelled by user."""
+    __slots__ = ()
+    
+    user_message = "変換がキャンセルされました"
+    
     def __init__(self, message):
         super().__init__(message, "CONVERSION_CANCELLED")
-        self.user_message = "変換がキャンセルされました"
 
 
 class OutputDirectoryError(ConversionError):
     """Exception raised when output directory is invalid or inaccessible."""
+    __slots__ = ("directory_path",)
+    
+    user_message = "出力ディレクトリにアクセスできません"
+    
     def __init__(self, message, directory_path=None):
         super().__init__(message, "OUTPUT_DIRECTORY_ERROR")
         self.directory_path = directory_path
-        self.user_message = "出力ディレクトリにアクセスできません"
 
 
 class SettingsError(ConversionError):
     """Exception raised when settings are invalid or corrupted."""
+    __slots__ = ("setting_key",)
+    
+    user_message = "設定の読み込みに失敗しました"
+    
     def __init__(self, message, setting_key=None):
         super().__init__(message, "SETTINGS_ERROR")
-        self.setting_key = setting_key
-        self.user_message = "設定の読み込みに失敗しました"
\ No newline at end of file
+        self.setting_key = setting_key
\ No newline at end of file
@@ -0,0 +1,399 @@
+"""
+File list model and delegate for displaying files and conversion progress.
+"""
+
+from typing import Any, Dict, List, Optional
+
+from PyQt6.QtCore import Qt, QAbstractListModel, QEvent, QModelIndex, QRect, QSize, pyqtSignal
+from PyQt6.QtGui import QColor, QFont, QPainter, QPixmap
+from PyQt6.QtWidgets import QStyle, QStyledItemDelegate, QStyleOptionViewItem
+
+
+# Custom item data roles
+PathRole = Qt.ItemDataRole.UserRole + 1
+NameRole = Qt.ItemDataRole.UserRole + 2
+SizeRole = Qt.ItemDataRole.UserRole + 3  # MB
+ProgressRole = Qt.ItemDataRole.UserRole + 4  # percent, -1 before conversion
+StatusRole = Qt.ItemDataRole.UserRole + 5  # one of the STATUS_* values
+MessageRole = Qt.ItemDataRole.UserRole + 6  # failure message
+
+# Conversion status of a row
+STATUS_WAITING = 0
+STATUS_CONVERTING = 1
+STATUS_SUCCESS = 2
+STATUS_FAILED = 3
+
+# Status line of a converting row per percent, so painting does not format
+_PROGRESS_STRS = tuple(f"変換中... {i}%" for i in range(101))
+
+
+class FileListModel(QAbstractListModel):
+    """
+    List model of the files queued for conversion.
+    
+    Rows are stored as parallel lists rather than one object per file, so a
+    row costs a few list slots instead of a tree of widgets.
+    """
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._paths: List[str] = []
+        self._names: List[str] = []
+        self._sizes: List[float] = []
+        self._progress: List[int] = []
+        self._statuses: List[int] = []
+        self._messages: List[str] = []
+        
+        # Prebuilt ConversionManager entries, so starting a batch is a copy
+        self._conversion_entries: List[Dict[str, str]] = []
+        
+        # First row of each file name, for O(1) lookups from progress slots
+        self._rows_by_name: Dict[str, int] = {}
+    
+    def _columns(self) -> tuple:
+        """Get every per-row list."""
+        return (self._paths, self._names, self._sizes, self._progress,
+                self._statuses, self._messages, self._conversion_entries)
+    
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        """Get the number of files (no children for valid parents)."""
+        if parent.isValid():
+            return 0
+        return len(self._paths)
+    
+    def data(self, index: QModelIndex, role: int = Qt.ItemDataRole.DisplayRole) -> Any:
+        """
+        Get the data of a row for a role.
+        
+        Args:
+            index (QModelIndex): Row index
+            role (int): Item data role
+        
+        Returns:
+            Any: Role value, or None for invalid indexes and unknown roles
+        """
+        if not index.isValid():
+            return None
+        
+        row = index.row()
+        if role in (Qt.ItemDataRole.DisplayRole, NameRole):
+            return self._names[row]
+        if role in (Qt.ItemDataRole.ToolTipRole, PathRole):
+            return self._paths[row]
+        if role == SizeRole:
+            return self._sizes[row]
+        if role == ProgressRole:
+            return self._progress[row]
+        if role == StatusRole:
+            return self._statuses[row]
+        if role == MessageRole:
+            return self._messages[row]
+        return None
+    
+    def setData(self, index: QModelIndex, value: Any, role: int = ProgressRole) -> bool:
+        """
+        Set the progress of a row.
+        
+        Repeated values do not emit ``dataChanged``.
+        
+        Args:
+            index (QModelIndex): Row index
+            value (Any): Progress in percent
+            role (int): Must be ``ProgressRole``
+        
+        Returns:
+            bool: True if the row was updated
+        """
+        if not index.isValid() or role != ProgressRole:
+            return False
+        
+        row = index.row()
+        progress = int(value)
+        if progress == self._progress[row] and self._statuses[row] == STATUS_CONVERTING:
+            # Nothing to repaint
+            return True
+        
+        self._progress[row] = progress
+        self._statuses[row] = STATUS_CONVERTING
+        self.dataChanged.emit(index, index, [ProgressRole, StatusRole])
+        return True
+    
+    def append_files(self, file_infos: List[Dict[str, Any]]) -> None:
+        """
+        Append files in a single insert.
+        
+        Args:
+            file_infos (List[Dict[str, Any]]): Results of ``FileManager.get_file_info``
+        """
+        if not file_infos:
+            return
+        
+        first = len(self._paths)
+        self.beginInsertRows(QModelIndex(), first, first + len(file_infos) - 1)
+        for file_info in file_infos:
+            self._paths.append(file_info['path'])
+            self._names.append(file_info['name'])
+            self._sizes.append(file_info['size_mb'])
+            self._progress.append(-1)
+            self._statuses.append(STATUS_WAITING)
+            self._messages.append('')
+            self._conversion_entries.append(
+                {'input_path': file_info['path'], 'output_name': file_info['name']}
+            )
+            self._rows_by_name.setdefault(file_info['name'], len(self._names) - 1)
+        self.endInsertRows()
+    
+    def remove_rows(self, rows: List[int]) -> None:
+        """
+        Remove rows, in as few contiguous removals as possible.
+        
+        Args:
+            rows (List[int]): Row numbers, in any order
+        """
+        rows = sorted(set(rows), reverse=True)
+        while rows:
+            last = first = rows.pop(0)
+            while rows and rows[0] == first - 1:
+                first = rows.pop(0)
+            
+            self.beginRemoveRows(QModelIndex(), first, last)
+            for column in self._columns():
+                del column[first:last + 1]
+            self.endRemoveRows()
+        
+        # Rows after the removed ones shifted
+        self._rows_by_name = {}
+        for row, name in enumerate(self._names):
+            self._rows_by_name.setdefault(name, row)
+    
+    def clear(self) -> None:
+        """Remove all rows."""
+        self.beginResetModel()
+        for column in self._columns():
+            column.clear()
+        self._rows_by_name.clear()
+        self.endResetModel()
+    
+    def row_for_name(self, name: str) -> int:
+        """
+        Find the row of a file by name.
+        
+        Args:
+            name (str): File name
+        
+        Returns:
+            int: Row number, or -1 if not listed
+        """
+        return self._rows_by_name.get(name, -1)
+    
+    def row_for_path(self, path: str) -> int:
+        """
+        Find the row of a file by path.
+        
+        Args:
+            path (str): Absolute file path
+        
+        Returns:
+            int: Row number, or -1 if not listed
+        """
+        try:
+            return self._paths.index(path)
+        except ValueError:
+            return -1
+    
+    def set_progress(self, name: str, progress: int) -> None:
+        """Update the conversion progress of a file."""
+        row = self.row_for_name(name)
+        if row >= 0:
+            self.setData(self.index(row), progress, ProgressRole)
+    
+    def set_conversion_status(self, name: str, success: bool, message: str = "") -> None:
+        """Set the final conversion status of a file."""
+        row = self.row_for_name(name)
+        if row < 0:
+            return
+        
+        self._statuses[row] = STATUS_SUCCESS if success else STATUS_FAILED
+        self._messages[row] = message
+        index = self.index(row)
+        self.dataChanged.emit(index, index, [StatusRole, MessageRole])
+    
+    def files_to_convert(self) -> List[Dict[str, Any]]:
+        """
+        Get the listed files in the form ``ConversionManager`` expects.
+        
+        The entries are shared with the model and must not be modified.
+        """
+        return list(self._conversion_entries)
+
+
+class FileItemDelegate(QStyledItemDelegate):
+    """
+    Paints file rows directly, without per-row widgets.
+    
+    Each row has a painted remove button; clicking it emits
+    ``remove_requested`` with the file path.
+    """
+    
+    remove_requested = pyqtSignal(str)
+    
+    ROW_HEIGHT = 76
+    MARGIN_H = 10
+    MARGIN_V = 6
+    ICON_WIDTH = 40
+    PROGRESS_HEIGHT = 6
+    REMOVE_SIZE = 24
+    
+    ICON = "🎬"
+    REMOVE_GLYPH = "✕"
+    
+    COLOR_SECONDARY = QColor("#8E8E93")
+    COLOR_ACCENT = QColor("#007AFF")
+    COLOR_SUCCESS = QColor("#34C759")
+    COLOR_ERROR = QColor("#FF3B30")
+    COLOR_TRACK = QColor("#F2F2F7")
+    
+    # ICON rendered once and shared by all rows and delegates
+    _icon_pixmap: Optional[QPixmap] = None
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._icon_font = QFont()
+        self._icon_font.setPixelSize(24)
+        self._name_font = QFont()
+        self._name_font.setPixelSize(14)
+        self._name_font.setWeight(QFont.Weight.Medium)
+        self._detail_font = QFont()
+        self._detail_font.setPixelSize(12)
+        self._remove_font = QFont()
+        self._remove_font.setPixelSize(14)
+        self._remove_font.setWeight(QFont.Weight.Bold)
+    
+    def _file_icon(self, device_pixel_ratio: float) -> QPixmap:
+        """Get the file icon, rendering the emoji on first use."""
+        pixmap = FileItemDelegate._icon_pixmap
+        if pixmap is None or pixmap.devicePixelRatio() != device_pixel_ratio:
+            size = round(self.ICON_WIDTH * device_pixel_ratio)
+            pixmap = QPixmap(size, size)
+            pixmap.setDevicePixelRatio(device_pixel_ratio)
+            pixmap.fill(Qt.GlobalColor.transparent)
+            
+            painter = QPainter(pixmap)
+            painter.setFont(self._icon_font)
+            painter.drawText(QRect(0, 0, self.ICON_WIDTH, self.ICON_WIDTH),
+                             Qt.AlignmentFlag.AlignCenter, self.ICON)
+            painter.end()
+            
+            FileItemDelegate._icon_pixmap = pixmap
+        return pixmap
+    
+    def _remove_rect(self, row_rect: QRect) -> QRect:
+        """Get the remove button area of a row."""
+        size = self.REMOVE_SIZE
+        return QRect(row_rect.right() - self.MARGIN_H - size + 1,
+                     row_rect.center().y() - size // 2, size, size)
+    
+    def sizeHint(self, option: QStyleOptionViewItem, index: QModelIndex) -> QSize:
+        """Every row has the same height."""
+        return QSize(option.rect.width(), self.ROW_HEIGHT)
+    
+    def paint(self, painter: QPainter, option: QStyleOptionViewItem, index: QModelIndex):
+        """Paint icon, name, size, progress bar and status of a row."""
+        opt = QStyleOptionViewItem(option)
+        self.initStyleOption(opt, index)
+        opt.text = ""
+        style = opt.widget.style() if opt.widget else None
+        
+        painter.save()
+        
+        # Background, selection and hover as styled by the view
+        if style:
+            style.drawPrimitive(QStyle.PrimitiveElement.PE_PanelItemViewItem, opt, painter, opt.widget)
+        
+        selected = bool(opt.state & QStyle.StateFlag.State_Selected)
+        rect = opt.rect.adjusted(self.MARGIN_H, self.MARGIN_V, -self.MARGIN_H, -self.MARGIN_V)
+        
+        # File icon
+        icon = self._file_icon(painter.device().devicePixelRatioF())
+        painter.drawPixmap(rect.left(), rect.center().y() - self.ICON_WIDTH // 2, icon)
+        
+        text_color = opt.palette.highlightedText().color() if selected else opt.palette.text().color()
+        
+        # Remove button
+        painter.setFont(self._remove_font)
+        painter.setPen(text_color if selected else self.COLOR_ERROR)
+        painter.drawText(self._remove_rect(opt.rect), Qt.AlignmentFlag.AlignCenter, self.REMOVE_GLYPH)
+        
+        text_left = rect.left() + self.ICON_WIDTH + 8
+        text_width = rect.right() - self.REMOVE_SIZE - 8 - text_left
+        y = rect.top()
+        
+        # File name
+        painter.setFont(self._name_font)
+        painter.setPen(text_color)
+        line_height = painter.fontMetrics().height()
+        name = painter.fontMetrics().elidedText(
+            index.data(NameRole), Qt.TextElideMode.ElideMiddle, text_width
+        )
+        painter.drawText(QRect(text_left, y, text_width, line_height),
+                         Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter, name)
+        y += line_height + 2
+        
+        # File size
+        painter.setFont(self._detail_font)
+        line_height = painter.fontMetrics().height()
+        painter.setPen(text_color if selected else self.COLOR_SECONDARY)
+        painter.drawText(QRect(text_left, y, text_width, line_height),
+                         Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter,
+                         f"サイズ: {index.data(SizeRole):.1f} MB")
+        y += line_height + 2
+        
+        status = index.data(StatusRole)
+        progress = -1
+        
+        # Progress bar, only while converting; other rows never read progress
+        if status == STATUS_CONVERTING:
+            progress = index.data(ProgressRole)
+            track = QRect(text_left, y, text_width, self.PROGRESS_HEIGHT)
+            painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+            painter.setPen(Qt.PenStyle.NoPen)
+            painter.setBrush(self.COLOR_TRACK)
+            painter.drawRoundedRect(track, 3, 3)
+            if progress > 0:
+                chunk = QRect(track)
+                chunk.setWidth(max(self.PROGRESS_HEIGHT, text_width * progress // 100))
+                painter.setBrush(self.COLOR_ACCENT)
+                painter.drawRoundedRect(chunk, 3, 3)
+        y += self.PROGRESS_HEIGHT + 2
+        
+        # Status
+        text, color = self._status_text(status, progress, index.data(MessageRole))
+        painter.setPen(text_color if selected else color)
+        text = painter.fontMetrics().elidedText(text, Qt.TextElideMode.ElideRight, text_width)
+        painter.drawText(QRect(text_left, y, text_width, line_height),
+                         Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter, text)
+        
+        painter.restore()
+    
+    def editorEvent(self, event, model, option: QStyleOptionViewItem, index: QModelIndex) -> bool:
+        """Handle clicks on the remove button of a row."""
+        if event.type() in (QEvent.Type.MouseButtonPress, QEvent.Type.MouseButtonRelease):
+            if (event.button() == Qt.MouseButton.LeftButton
+                    and self._remove_rect(option.rect).contains(event.position().toPoint())):
+                # Presses are consumed too, so clicking the button does not select the row
+                if event.type() == QEvent.Type.MouseButtonRelease:
+                    self.remove_requested.emit(index.data(PathRole))
+                return True
+        return super().editorEvent(event, model, option, index)
+    
+    def _status_text(self, status: int, progress: int, message: str):
+        """Get the status line text and color of a row."""
+        if status == STATUS_CONVERTING:
+            if progress < 100:
+                return _PROGRESS_STRS[max(progress, 0)], self.COLOR_ACCENT
+            return "完了", self.COLOR_SUCCESS
+        if status == STATUS_SUCCESS:
+            return "✅ 成功", self.COLOR_SUCCESS
+        if status == STATUS_FAILED:
+            return f"❌ 失敗: {message}", self.COLOR_ERROR
+        return "待機中", self.COLOR_SECONDARY
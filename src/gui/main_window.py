@@ -2,29 +2,132 @@
 Main window for MP4 to MP3 Converter application.
 """
 
-import os
-from pathlib import Path
-from typing import List, Optional
+from typing import List
 from PyQt6.QtWidgets import (
     QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QPushButton,
-    QLabel, QProgressBar, QListWidget, QListWidgetItem, QFileDialog,
-    QMessageBox, QGroupBox, QSplitter, QFrame, QMenuBar, QMenu
+    QLabel, QProgressBar, QListView, QFileDialog,
+    QMessageBox, QGroupBox, QSplitter
 )
-from PyQt6.QtCore import Qt, QThread, pyqtSignal, QTimer, QPoint
-from PyQt6.QtGui import QDragEnterEvent, QDropEvent, QIcon, QAction
+from PyQt6.QtCore import Qt, QThread, QObject, QRunnable, QThreadPool, pyqtSignal, pyqtSlot
+from PyQt6.QtGui import QDragEnterEvent, QDropEvent, QAction
 
 from utils.logger import get_logger
 from utils.file_manager import FileManager
-from converter.conversion_manager import ConversionManager
+from converter.conversion_manager import ConversionManager, snapshot_settings
 from config.settings import Settings
-from gui.settings_dialog import SettingsDialog
-from gui.file_list_item import FileListItem
-from exceptions import ConversionError, FFmpegNotFoundError
+from gui.file_list_model import FileListModel, FileItemDelegate
+
+
+# Status bar message while a batch runs: (completed, total)
+PROGRESS_MESSAGE = "変換中... %d/%d ファイル完了"
+
+# Style sheet for the window contents, parsed once; widgets are selected by
+# object name or the "role" property instead of carrying their own sheets
+MAIN_WINDOW_QSS = """
+    QPushButton {
+        background-color: #007AFF;
+        color: white;
+        border: none;
+        border-radius: 8px;
+        padding: 8px 16px;
+        font-size: 14px;
+        font-weight: 500;
+    }
+    QPushButton:hover {
+        background-color: #0056CC;
+    }
+    QPushButton:pressed {
+        background-color: #004499;
+    }
+    QPushButton:disabled {
+        background-color: #C7C7CC;
+        color: #8E8E93;
+    }
+    QPushButton[role="primary"] {
+        background-color: #34C759;
+        padding: 12px 24px;
+        font-size: 16px;
+        font-weight: 600;
+    }
+    QPushButton[role="primary"]:hover {
+        background-color: #28A745;
+    }
+    QPushButton[role="primary"]:pressed {
+        background-color: #218838;
+    }
+    QPushButton[role="primary"]:disabled {
+        background-color: #C7C7CC;
+        color: #8E8E93;
+    }
+    QLabel#drop_label {
+        border: 2px dashed #8E8E93;
+        border-radius: 8px;
+        padding: 40px;
+        background-color: rgba(255, 255, 255, 0.5);
+        color: #8E8E93;
+        font-size: 14px;
+    }
+    QLabel#drop_label:hover {
+        border-color: #007AFF;
+        background-color: rgba(0, 122, 255, 0.1);
+    }
+    QLabel#output_path_label {
+        color: #8E8E93;
+        padding: 5px;
+    }
+    QListView#file_list {
+        border: 1px solid #E5E5EA;
+        border-radius: 8px;
+        background-color: white;
+    }
+    QListView#file_list::item {
+        border-bottom: 1px solid #F2F2F7;
+    }
+    QListView#file_list::item:hover {
+        background-color: #F2F2F7;
+    }
+    QListView#file_list::item:selected {
+        background-color: #007AFF;
+        color: white;
+    }
+"""
+
+
+class IngestSignals(QObject):
+    """Signals of an ingest worker."""
+    
+    # (file infos of the valid files, invalid file paths)
+    done = pyqtSignal(list, list)
+
+
+class _IngestWorker(QRunnable):
+    """
+    Validates dropped or selected files and gathers their info on a pool
+    thread, so the filesystem access does not block the GUI.
+    """
+    
+    def __init__(self, file_manager: FileManager, file_paths: List[str]):
+        super().__init__()
+        self.file_manager = file_manager
+        self.file_paths = file_paths
+        self.signals = IngestSignals()
+    
+    def run(self):
+        """Validate the files and emit their info."""
+        valid_files, invalid_files = self.file_manager.validate_input_files(self.file_paths)
+        file_infos = [self.file_manager.get_file_info(file_path) for file_path in valid_files]
+        self.signals.done.emit(file_infos, invalid_files)
 
 
 class MainWindow(QMainWindow):
     """Main application window."""
     
+    # Extensions accepted from drops, for str.endswith before any filesystem access
+    VALID_EXTS = tuple(sorted(FileManager.SUPPORTED_EXTENSIONS))
+    
+    # Starts a batch on the conversion thread
+    conversion_requested = pyqtSignal(list, object)  # files, settings snapshot
+    
     def __init__(self, settings: Settings):
         super().__init__()
         self.settings = settings
@@ -32,7 +135,14 @@ class MainWindow(QMainWindow):
         self.file_manager = FileManager()
         self.file_manager.set_logger(self.logger)
         self.conversion_manager = None
+        self._settings_dialog = None  # created on first use
         self.conversion_thread = None
+        self._overall_shown = (0, 0)  # (completed, total) in the status bar
+        self._ingest_worker = None  # pending _IngestWorker, if any
+        
+        # Whether an output directory is set, kept current by settings_changed
+        self._has_output = bool(self.settings.get('output_directory'))
+        self.settings.settings_changed.connect(self._on_settings_changed)
         
         self.setAcceptDrops(True)
         self.setup_ui()
@@ -47,8 +157,10 @@ class MainWindow(QMainWindow):
         self.setWindowTitle("MP4 to MP3 Converter")
         self.setMinimumSize(800, 600)
         
-        # Central widget
+        # Central widget; the style sheet is set here rather than on the
+        # window so it does not cascade into dialogs parented to the window
         central_widget = QWidget()
+        central_widget.setStyleSheet(MAIN_WINDOW_QSS)
         self.setCentralWidget(central_widget)
         
         # Main layout
@@ -84,28 +196,14 @@ class MainWindow(QMainWindow):
         
         self.drop_label = QLabel("📁\n\nMP4ファイルをここにドラッグ＆ドロップ")
         self.drop_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        self.drop_label.setStyleSheet("""
-            QLabel {
-                border: 2px dashed #8E8E93;
-                border-radius: 8px;
-                padding: 40px;
-                background-color: rgba(255, 255, 255, 0.5);
-                color: #8E8E93;
-                font-size: 14px;
-            }
-            QLabel:hover {
-                border-color: #007AFF;
-                background-color: rgba(0, 122, 255, 0.1);
-            }
-        """)
+        self.drop_label.setObjectName("drop_label")
         
         drop_layout.addWidget(self.drop_label)
         
         # Add files button
-        add_files_btn = QPushButton("📁 ファイルを追加")
-        add_files_btn.clicked.connect(self.add_files)
-        add_files_btn.setStyleSheet(self.get_button_style())
-        drop_layout.addWidget(add_files_btn)
+        self.add_files_btn = QPushButton("📁 ファイルを追加")
+        self.add_files_btn.clicked.connect(self.add_files)
+        drop_layout.addWidget(self.add_files_btn)
         
         layout.addWidget(drop_group)
         
@@ -114,12 +212,11 @@ class MainWindow(QMainWindow):
         output_layout = QVBoxLayout(output_group)
         
         self.output_path_label = QLabel("未設定")
-        self.output_path_label.setStyleSheet("color: #8E8E93; padding: 5px;")
+        self.output_path_label.setObjectName("output_path_label")
         self.output_path_label.setWordWrap(True)
         
         select_output_btn = QPushButton("📁 出力フォルダを選択")
         select_output_btn.clicked.connect(self.select_output_directory)
-        select_output_btn.setStyleSheet(self.get_button_style())
         
         output_layout.addWidget(self.output_path_label)
         output_layout.addWidget(select_output_btn)
@@ -133,12 +230,11 @@ class MainWindow(QMainWindow):
         self.convert_btn = QPushButton("🔄 変換を開始")
         self.convert_btn.clicked.connect(self.start_conversion)
         self.convert_btn.setEnabled(False)
-        self.convert_btn.setStyleSheet(self.get_primary_button_style())
+        self.convert_btn.setProperty("role", "primary")
         
         self.cancel_btn = QPushButton("⏹ キャンセル")
         self.cancel_btn.clicked.connect(self.cancel_conversion)
         self.cancel_btn.setEnabled(False)
-        self.cancel_btn.setStyleSheet(self.get_button_style())
         
         control_layout.addWidget(self.convert_btn)
         control_layout.addWidget(self.cancel_btn)
@@ -159,23 +255,18 @@ class MainWindow(QMainWindow):
         panel = QWidget()
         layout = QVBoxLayout(panel)
         
-        # File list
-        self.file_list = QListWidget()
-        self.file_list.setStyleSheet("""
-            QListWidget {
-                border: 1px solid #E5E5EA;
-                border-radius: 8px;
-                background-color: white;
-            }
-            QListWidget::item {
-                border-bottom: 1px solid #F2F2F7;
-                padding: 8px;
-            }
-            QListWidget::item:selected {
-                background-color: #007AFF;
-                color: white;
-            }
-        """)
+        # File list; rows are painted by the delegate, not built from widgets
+        self.file_model = FileListModel(self)
+        self.file_list = QListView()
+        self.file_list.setModel(self.file_model)
+        self.file_delegate = FileItemDelegate(self.file_list)
+        self.file_delegate.remove_requested.connect(self.on_remove_requested)
+        self.file_list.setItemDelegate(self.file_delegate)
+        self.file_list.setSelectionMode(QListView.SelectionMode.ExtendedSelection)
+        self.file_list.setUniformItemSizes(True)
+        self.file_list.setLayoutMode(QListView.LayoutMode.Batched)
+        self.file_list.setBatchSize(64)
+        self.file_list.setObjectName("file_list")
         
         layout.addWidget(self.file_list)
         
@@ -184,11 +275,9 @@ class MainWindow(QMainWindow):
         
         self.remove_selected_btn = QPushButton("🗑 選択削除")
         self.remove_selected_btn.clicked.connect(self.remove_selected_files)
-        self.remove_selected_btn.setStyleSheet(self.get_button_style())
         
         self.clear_all_btn = QPushButton("🗑 すべてクリア")
         self.clear_all_btn.clicked.connect(self.clear_all_files)
-        self.clear_all_btn.setStyleSheet(self.get_button_style())
         
         controls_layout.addWidget(self.remove_selected_btn)
         controls_layout.addWidget(self.clear_all_btn)
@@ -234,27 +323,37 @@ class MainWindow(QMainWindow):
     
     def setup_conversion_manager(self):
         """Setup the conversion manager and thread."""
-        self.conversion_manager = ConversionManager(self.settings)
+        self.conversion_thread = QThread(self)
+        self.conversion_manager = ConversionManager()
         self.conversion_manager.set_logger(self.logger)
-        
-        # Connect signals
-        self.conversion_manager.conversion_started.connect(self.on_conversion_started)
-        self.conversion_manager.conversion_progress.connect(self.on_conversion_progress)
-        self.conversion_manager.conversion_completed.connect(self.on_conversion_completed)
-        self.conversion_manager.conversion_error.connect(self.on_conversion_error)
-        self.conversion_manager.all_conversions_completed.connect(self.on_all_conversions_completed)
+        self.conversion_manager.moveToThread(self.conversion_thread)
+        
+        # Connect signals; queued both ways so neither thread waits on the other
+        queued = Qt.ConnectionType.QueuedConnection
+        manager = self.conversion_manager
+        manager.conversion_started.connect(self.on_conversion_started, queued)
+        manager.conversion_progress.connect(self.on_conversion_progress, queued)
+        manager.conversion_completed.connect(self.on_conversion_completed, queued)
+        manager.conversion_error.connect(self.on_conversion_error, queued)
+        manager.all_conversions_completed.connect(self.on_all_conversions_completed, queued)
+        self.conversion_requested.connect(manager.start_conversion, queued)
+        
+        # The manager owns a timer, so it has to be destroyed on its own thread
+        self.conversion_thread.finished.connect(manager.deleteLater)
+        self.conversion_thread.start()
     
     def dragEnterEvent(self, event: QDragEnterEvent):
         """Handle drag enter events."""
-        if event.mimeData().hasUrls():
+        if event.mimeData().hasUrls() and self._ingest_worker is None:
             event.acceptProposedAction()
     
     def dropEvent(self, event: QDropEvent):
         """Handle drop events."""
+        # Only the extension is checked here; the ingest worker stats the files
         files = []
         for url in event.mimeData().urls():
             file_path = url.toLocalFile()
-            if os.path.isfile(file_path):
+            if file_path.lower().endswith(self.VALID_EXTS):
                 files.append(file_path)
         
         if files:
@@ -273,17 +372,27 @@ class MainWindow(QMainWindow):
             self.add_files_to_list(files)
     
     def add_files_to_list(self, file_paths: List[str]):
-        """Add files to the conversion list."""
-        valid_files, invalid_files = self.file_manager.validate_input_files(file_paths)
-        
-        for file_path in valid_files:
-            file_info = self.file_manager.get_file_info(file_path)
-            item = FileListItem(file_info)
-            list_item = QListWidgetItem()
-            list_item.setSizeHint(item.sizeHint())
-            
-            self.file_list.addItem(list_item)
-            self.file_list.setItemWidget(list_item, item)
+        """Validate files in the background and add them to the conversion list."""
+        if self._ingest_worker is not None:
+            return
+        
+        self._ingest_worker = _IngestWorker(self.file_manager, file_paths)
+        self._ingest_worker.signals.done.connect(
+            self._on_ingest_done, Qt.ConnectionType.QueuedConnection
+        )
+        self.drop_label.setEnabled(False)
+        self.add_files_btn.setEnabled(False)
+        self.status_bar.showMessage("ファイルを確認中...")
+        QThreadPool.globalInstance().start(self._ingest_worker)
+    
+    @pyqtSlot(list, list)
+    def _on_ingest_done(self, file_infos: List[dict], invalid_files: List[str]):
+        """Add the files validated by the ingest worker."""
+        self._ingest_worker = None
+        self.drop_label.setEnabled(True)
+        self.add_files_btn.setEnabled(True)
+        
+        self.file_model.append_files(file_infos)
         
         if invalid_files:
             QMessageBox.warning(
@@ -294,20 +403,25 @@ class MainWindow(QMainWindow):
             )
         
         self.update_convert_button_state()
-        self.status_bar.showMessage(f"{len(valid_files)}個のファイルを追加しました")
+        self.status_bar.showMessage(f"{len(file_infos)}個のファイルを追加しました")
     
     def remove_selected_files(self):
         """Remove selected files from the list."""
-        selected_items = self.file_list.selectedItems()
-        for item in selected_items:
-            row = self.file_list.row(item)
-            self.file_list.takeItem(row)
+        rows = [index.row() for index in self.file_list.selectionModel().selectedRows()]
+        self.file_model.remove_rows(rows)
         
         self.update_convert_button_state()
     
+    def on_remove_requested(self, file_path: str):
+        """Remove a file whose remove button was clicked."""
+        row = self.file_model.row_for_path(file_path)
+        if row >= 0:
+            self.file_model.remove_rows([row])
+            self.update_convert_button_state()
+    
     def clear_all_files(self):
         """Clear all files from the list."""
-        self.file_list.clear()
+        self.file_model.clear()
         self.update_convert_button_state()
     
     def select_output_directory(self):
@@ -316,36 +430,36 @@ class MainWindow(QMainWindow):
         if directory:
             self.settings.set('output_directory', directory)
             self.output_path_label.setText(directory)
-            self.update_convert_button_state()
+    
+    def _on_settings_changed(self, key: str, value):
+        """Track whether an output directory is set."""
+        if key == 'output_directory':
+            self._has_output = bool(value)
+        elif key == Settings.ALL_KEYS:
+            self._has_output = bool(self.settings.get('output_directory'))
+        else:
+            return
+        self.update_convert_button_state()
     
     def update_convert_button_state(self):
         """Update convert button enabled state."""
-        has_files = self.file_list.count() > 0
-        has_output = bool(self.settings.get('output_directory'))
-        self.convert_btn.setEnabled(has_files and has_output)
+        self.convert_btn.setEnabled(self._has_output and self.file_model.rowCount() > 0)
     
     def start_conversion(self):
         """Start the conversion process."""
-        if self.file_list.count() == 0:
+        if self.file_model.rowCount() == 0:
             QMessageBox.warning(self, "エラー", "変換するファイルがありません。")
             return
         
-        if not self.settings.get('output_directory'):
+        if not self._has_output:
             QMessageBox.warning(self, "エラー", "出力フォルダを選択してください。")
             return
         
-        # Collect files to convert
-        files_to_convert = []
-        for i in range(self.file_list.count()):
-            item = self.file_list.item(i)
-            widget = self.file_list.itemWidget(item)
-            files_to_convert.append({
-                'input_path': widget.file_info['path'],
-                'output_name': widget.file_info['name']
-            })
-
-        # Start conversion
-        self.conversion_manager.start_conversion(files_to_convert)
+        # Start conversion on the conversion thread; the settings are read
+        # here, as only this thread may touch them
+        self.conversion_requested.emit(
+            self.file_model.files_to_convert(), snapshot_settings(self.settings)
+        )
     
     def cancel_conversion(self):
         """Cancel the current conversion."""
@@ -359,30 +473,24 @@ class MainWindow(QMainWindow):
         self.overall_progress.setVisible(True)
         self.overall_progress.setMaximum(total_files)
         self.overall_progress.setValue(0)
-        self.status_bar.showMessage(f"変換中... 0/{total_files} ファイル完了")
+        self.status_bar.showMessage(PROGRESS_MESSAGE % (0, total_files))
+        self._overall_shown = (0, total_files)
     
     def on_conversion_progress(self, file_name: str, progress: int, current: int, total: int):
         """Handle conversion progress signal."""
         # Update individual file progress
-        for i in range(self.file_list.count()):
-            item = self.file_list.item(i)
-            widget = self.file_list.itemWidget(item)
-            if widget.file_info['name'] == file_name:
-                widget.update_progress(progress)
-                break
-        
-        # Update overall progress
-        self.overall_progress.setValue(current)
-        self.status_bar.showMessage(f"変換中... {current}/{total} ファイル完了")
+        self.file_model.set_progress(file_name, progress)
+        
+        # Update overall progress; it only moves when a file completes, and
+        # each flush from the manager repeats it for every converting file
+        if (current, total) != self._overall_shown:
+            self._overall_shown = (current, total)
+            self.overall_progress.setValue(current)
+            self.status_bar.showMessage(PROGRESS_MESSAGE % (current, total))
     
     def on_conversion_completed(self, file_name: str, success: bool, message: str):
         """Handle individual conversion completion."""
-        for i in range(self.file_list.count()):
-            item = self.file_list.item(i)
-            widget = self.file_list.itemWidget(item)
-            if widget.file_info['name'] == file_name:
-                widget.set_conversion_status(success, message)
-                break
+        self.file_model.set_conversion_status(file_name, success, message)
     
     def on_conversion_error(self, error_message: str):
         """Handle conversion error."""
@@ -393,6 +501,8 @@ class MainWindow(QMainWindow):
         self.convert_btn.setEnabled(True)
         self.cancel_btn.setEnabled(False)
         self.overall_progress.setVisible(False)
+        # Sizes and modification times may have changed, e.g. when originals were deleted
+        self.file_manager.clear_stat_cache()
         
         if success_count == total_count:
             self.status_bar.showMessage(f"完了: {success_count}/{total_count} ファイル変換成功")
@@ -412,8 +522,13 @@ class MainWindow(QMainWindow):
     
     def show_settings(self):
         """Show settings dialog."""
-        dialog = SettingsDialog(self.settings, self)
-        dialog.exec()
+        # Imported on first use to keep it out of application startup
+        from gui.settings_dialog import SettingsDialog
+        
+        # Kept for later opens; it reloads the settings every time it is shown
+        if self._settings_dialog is None:
+            self._settings_dialog = SettingsDialog(self.settings, self)
+        self._settings_dialog.exec()
     
     def show_about(self):
         """Show about dialog."""
@@ -444,12 +559,13 @@ class MainWindow(QMainWindow):
         """Save application settings."""
         self.settings.set('window_geometry', self.saveGeometry())
         self.settings.set('window_state', self.saveState())
+        self.settings.sync()
     
     def closeEvent(self, event):
         """Handle window close event."""
         self.save_settings()
         
-        # Cancel any ongoing conversion
+        # Confirm cancelling any ongoing conversion
         if self.conversion_manager and self.conversion_manager.is_converting():
             reply = QMessageBox.question(
                 self,
@@ -457,58 +573,17 @@ class MainWindow(QMainWindow):
                 "変換が進行中です。終了しますか？",
                 QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
             )
-            if reply == QMessageBox.StandardButton.Yes:
-                self.conversion_manager.cancel_conversion()
-            else:
+            if reply != QMessageBox.StandardButton.Yes:
                 event.ignore()
                 return
         
+        if self.conversion_thread:
+            # Wait for the pool tasks and pending deletions before the
+            # thread, and the manager with it, goes away
+            self.conversion_manager.shutdown()
+            self.conversion_thread.quit()
+            self.conversion_thread.wait()
+            self.conversion_thread = None
+            self.conversion_manager = None  # deleted with its thread
+        
         event.accept()
-    
-    def get_button_style(self) -> str:
-        """Get standard button style."""
-        return """
-            QPushButton {
-                background-color: #007AFF;
-                color: white;
-                border: none;
-                border-radius: 8px;
-                padding: 8px 16px;
-                font-size: 14px;
-                font-weight: 500;
-            }
-            QPushButton:hover {
-                background-color: #0056CC;
-            }
-            QPushButton:pressed {
-                background-color: #004499;
-            }
-            QPushButton:disabled {
-                background-color: #C7C7CC;
-                color: #8E8E93;
-            }
-        """
-    
-    def get_primary_button_style(self) -> str:
-        """Get primary button style."""
-        return """
-            QPushButton {
-                background-color: #34C759;
-                color: white;
-                border: none;
-                border-radius: 8px;
-                padding: 12px 24px;
-                font-size: 16px;
-                font-weight: 600;
-            }
-            QPushButton:hover {
-                background-color: #28A745;
-            }
-            QPushButton:pressed {
-                background-color: #218838;
-            }
-            QPushButton:disabled {
-                background-color: #C7C7CC;
-                color: #8E8E93;
-            }
-        """
@@ -3,7 +3,7 @@ Settings dialog for MP4 to MP3 Converter application.
 """
 
 from PyQt6.QtWidgets import (
-    QDialog, QVBoxLayout, QHBoxLayout, QGroupBox, QLabel,
+    QDialog, QWidget, QVBoxLayout, QHBoxLayout, QGroupBox, QLabel,
     QComboBox, QCheckBox, QSpinBox, QPushButton, QLineEdit,
     QFileDialog, QMessageBox
 )
@@ -12,21 +12,102 @@ from PyQt6.QtGui import QIcon
 from config.settings import Settings
 
 
+# Style sheet for the button row, parsed once; buttons are selected by the
+# "role" property instead of carrying their own sheets
+BUTTON_BAR_QSS = """
+    QPushButton {
+        background-color: #007AFF;
+        color: white;
+        border: none;
+        border-radius: 6px;
+        padding: 6px 12px;
+        font-size: 13px;
+    }
+    QPushButton:hover {
+        background-color: #0056CC;
+    }
+    QPushButton:pressed {
+        background-color: #004499;
+    }
+    QPushButton[role="primary"] {
+        background-color: #34C759;
+        padding: 8px 16px;
+        font-weight: 500;
+    }
+    QPushButton[role="primary"]:hover {
+        background-color: #28A745;
+    }
+    QPushButton[role="primary"]:pressed {
+        background-color: #218838;
+    }
+    QPushButton[role="secondary"] {
+        background-color: #8E8E93;
+    }
+    QPushButton[role="secondary"]:hover {
+        background-color: #636366;
+    }
+    QPushButton[role="secondary"]:pressed {
+        background-color: #48484A;
+    }
+"""
+
+
 class SettingsDialog(QDialog):
     """Settings configuration dialog."""
     
+    # Settings shown in the dialog, read in one batch by load_settings
+    SETTING_KEYS = (
+        'audio_quality', 'file_naming_pattern', 'output_directory',
+        'auto_open_folder', 'delete_original', 'preserve_metadata',
+        'volume_normalization', 'max_concurrent_conversions',
+    )
+    
     def __init__(self, settings: Settings, parent=None):
         super().__init__(parent)
         self.settings = settings
         self.setWindowTitle("設定")
         self.setModal(True)
         self.setMinimumWidth(400)
+        
+        # The setting sections are built on first show, see showEvent
+        self._populated = False
+        self._dir_dialog = None
         self.setup_ui()
-        self.load_settings()
     
     def setup_ui(self):
-        """Setup the user interface."""
+        """Setup the dialog skeleton: the layout and the button row."""
         layout = QVBoxLayout(self)
+        self._layout = layout
+        
+        # Buttons; the style sheet is set on their row only so it does not
+        # cascade into the setting widgets
+        button_bar = QWidget()
+        button_bar.setStyleSheet(BUTTON_BAR_QSS)
+        button_layout = QHBoxLayout(button_bar)
+        button_layout.setContentsMargins(0, 0, 0, 0)
+        
+        self.reset_btn = QPushButton("初期値に戻す")
+        self.reset_btn.clicked.connect(self.reset_to_defaults)
+        self.reset_btn.setProperty("role", "secondary")
+        
+        button_layout.addWidget(self.reset_btn)
+        button_layout.addStretch()
+        
+        self.cancel_btn = QPushButton("キャンセル")
+        self.cancel_btn.clicked.connect(self.reject)
+        
+        self.ok_btn = QPushButton("OK")
+        self.ok_btn.clicked.connect(self.save_settings)
+        self.ok_btn.setProperty("role", "primary")
+        
+        button_layout.addWidget(self.cancel_btn)
+        button_layout.addWidget(self.ok_btn)
+        
+        layout.addWidget(button_bar)
+    
+    def _populate(self):
+        """Build the setting sections above the button row."""
+        layout = self._layout
         
         # Audio Quality
         quality_group = QGroupBox("音質設定")
@@ -42,7 +123,7 @@ class SettingsDialog(QDialog):
         quality_layout.addWidget(quality_label)
         quality_layout.addWidget(self.quality_combo)
         
-        layout.addWidget(quality_group)
+        layout.insertWidget(0, quality_group)
         
         # File Naming
         naming_group = QGroupBox("ファイル命名")
@@ -58,7 +139,7 @@ class SettingsDialog(QDialog):
         naming_layout.addWidget(naming_label)
         naming_layout.addWidget(self.naming_combo)
         
-        layout.addWidget(naming_group)
+        layout.insertWidget(1, naming_group)
         
         # Output Settings
         output_group = QGroupBox("出力設定")
@@ -85,7 +166,7 @@ class SettingsDialog(QDialog):
         self.delete_original_checkbox = QCheckBox("変換後に元ファイルを削除")
         output_layout.addWidget(self.delete_original_checkbox)
         
-        layout.addWidget(output_group)
+        layout.insertWidget(2, output_group)
         
         # Conversion Settings
         conversion_group = QGroupBox("変換設定")
@@ -112,94 +193,75 @@ class SettingsDialog(QDialog):
         self.volume_normalization_checkbox = QCheckBox("音量を正規化")
         conversion_layout.addWidget(self.volume_normalization_checkbox)
         
-        layout.addWidget(conversion_group)
+        layout.insertWidget(3, conversion_group)
         
-        # Buttons
-        button_layout = QHBoxLayout()
-        
-        self.reset_btn = QPushButton("初期値に戻す")
-        self.reset_btn.clicked.connect(self.reset_to_defaults)
-        self.reset_btn.setStyleSheet(self.get_secondary_button_style())
-        
-        button_layout.addWidget(self.reset_btn)
-        button_layout.addStretch()
-        
-        self.cancel_btn = QPushButton("キャンセル")
-        self.cancel_btn.clicked.connect(self.reject)
-        self.cancel_btn.setStyleSheet(self.get_button_style())
-        
-        self.ok_btn = QPushButton("OK")
-        self.ok_btn.clicked.connect(self.save_settings)
-        self.ok_btn.setStyleSheet(self.get_primary_button_style())
-        
-        button_layout.addWidget(self.cancel_btn)
-        button_layout.addWidget(self.ok_btn)
-        
-        layout.addLayout(button_layout)
+        self._populated = True
+    
+    def showEvent(self, event):
+        """Build the sections on first show and load the current settings."""
+        if not self._populated:
+            self._populate()
+            self.adjustSize()
+        self.load_settings()
+        super().showEvent(event)
     
     def load_settings(self):
         """Load current settings into the UI."""
+        values = self.settings.get_many(self.SETTING_KEYS)
+        
         # Audio quality
-        current_quality = self.settings.get('audio_quality')
-        index = self.quality_combo.findData(current_quality)
+        index = self.quality_combo.findData(values['audio_quality'])
         if index >= 0:
             self.quality_combo.setCurrentIndex(index)
         
         # File naming
-        current_pattern = self.settings.get('file_naming_pattern')
-        index = self.naming_combo.findData(current_pattern)
+        index = self.naming_combo.findData(values['file_naming_pattern'])
         if index >= 0:
             self.naming_combo.setCurrentIndex(index)
         
         # Output directory
-        output_dir = self.settings.get('output_directory')
-        self.output_dir_edit.setText(output_dir)
+        self.output_dir_edit.setText(values['output_directory'])
         
         # Checkboxes
-        self.auto_open_checkbox.setChecked(self.settings.get('auto_open_folder'))
-        self.delete_original_checkbox.setChecked(self.settings.get('delete_original'))
-        self.preserve_metadata_checkbox.setChecked(self.settings.get('preserve_metadata'))
-        self.volume_normalization_checkbox.setChecked(self.settings.get('volume_normalization'))
+        self.auto_open_checkbox.setChecked(values['auto_open_folder'])
+        self.delete_original_checkbox.setChecked(values['delete_original'])
+        self.preserve_metadata_checkbox.setChecked(values['preserve_metadata'])
+        self.volume_normalization_checkbox.setChecked(values['volume_normalization'])
         
         # Concurrent conversions
-        self.concurrent_spin.setValue(self.settings.get('max_concurrent_conversions'))
+        self.concurrent_spin.setValue(values['max_concurrent_conversions'])
     
     def save_settings(self):
         """Save settings from the UI."""
-        # Audio quality
-        quality_index = self.quality_combo.currentIndex()
-        quality_value = self.quality_combo.itemData(quality_index)
-        self.settings.set('audio_quality', quality_value)
-        
-        # File naming
-        naming_index = self.naming_combo.currentIndex()
-        naming_value = self.naming_combo.itemData(naming_index)
-        self.settings.set('file_naming_pattern', naming_value)
+        values = {
+            'audio_quality': self.quality_combo.currentData(),
+            'file_naming_pattern': self.naming_combo.currentData(),
+            'auto_open_folder': self.auto_open_checkbox.isChecked(),
+            'delete_original': self.delete_original_checkbox.isChecked(),
+            'preserve_metadata': self.preserve_metadata_checkbox.isChecked(),
+            'volume_normalization': self.volume_normalization_checkbox.isChecked(),
+            'max_concurrent_conversions': self.concurrent_spin.value(),
+        }
         
         # Output directory
         output_dir = self.output_dir_edit.text()
         if output_dir:
-            self.settings.set('output_directory', output_dir)
+            values['output_directory'] = output_dir
         
-        # Checkboxes
-        self.settings.set('auto_open_folder', self.auto_open_checkbox.isChecked())
-        self.settings.set('delete_original', self.delete_original_checkbox.isChecked())
-        self.settings.set('preserve_metadata', self.preserve_metadata_checkbox.isChecked())
-        self.settings.set('volume_normalization', self.volume_normalization_checkbox.isChecked())
-        
-        # Concurrent conversions
-        self.settings.set('max_concurrent_conversions', self.concurrent_spin.value())
+        # One write pass and a single change notification
+        self.settings.set_many(values)
         
         self.accept()
     
     def select_output_directory(self):
         """Select output directory."""
-        from PyQt6.QtWidgets import QFileDialog
-        
-        dialog = QFileDialog(self)
-        dialog.setFileMode(QFileDialog.FileMode.Directory)
-        dialog.setOption(QFileDialog.Option.ShowDirsOnly, True)
-        dialog.setWindowTitle("出力フォルダを選択")
+        # Built on the first click and reused afterwards
+        if self._dir_dialog is None:
+            self._dir_dialog = QFileDialog(self)
+            self._dir_dialog.setFileMode(QFileDialog.FileMode.Directory)
+            self._dir_dialog.setOption(QFileDialog.Option.ShowDirsOnly, True)
+            self._dir_dialog.setWindowTitle("出力フォルダを選択")
+        dialog = self._dir_dialog
         
         if dialog.exec():
             selected_dirs = dialog.selectedFiles()
@@ -218,61 +280,3 @@ class SettingsDialog(QDialog):
         if reply == QMessageBox.StandardButton.Yes:
             self.settings.reset_to_defaults()
             self.load_settings()
-    
-    def get_button_style(self) -> str:
-        """Get standard button style."""
-        return """
-            QPushButton {
-                background-color: #007AFF;
-                color: white;
-                border: none;
-                border-radius: 6px;
-                padding: 6px 12px;
-                font-size: 13px;
-            }
-            QPushButton:hover {
-                background-color: #0056CC;
-            }
-            QPushButton:pressed {
-                background-color: #004499;
-            }
-        """
-    
-    def get_primary_button_style(self) -> str:
-        """Get primary button style."""
-        return """
-            QPushButton {
-                background-color: #34C759;
-                color: white;
-                border: none;
-                border-radius: 6px;
-                padding: 8px 16px;
-                font-size: 13px;
-                font-weight: 500;
-            }
-            QPushButton:hover {
-                background-color: #28A745;
-            }
-            QPushButton:pressed {
-                background-color: #218838;
-            }
-        """
-    
-    def get_secondary_button_style(self) -> str:
-        """Get secondary button style."""
-        return """
-            QPushButton {
-                background-color: #8E8E93;
-                color: white;
-                border: none;
-                border-radius: 6px;
-                padding: 6px 12px;
-                font-size: 13px;
-            }
-            QPushButton:hover {
-                background-color: #636366;
-            }
-            QPushButton:pressed {
-                background-color: #48484A;
-            }
-        """
\ No newline at end of file
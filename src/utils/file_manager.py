@@ -4,8 +4,10 @@ File manager utility for MP4 to MP3 Converter application.
 
 import os
 import shutil
+import time
+from stat import S_ISREG
 from pathlib import Path
-from typing import List, Optional, Tuple
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
 from exceptions import FileValidationError, OutputDirectoryError, DiskSpaceError
 
 
@@ -13,10 +15,19 @@ class FileManager:
     """Manages file operations for the converter application."""
     
     # Supported video file extensions
-    SUPPORTED_EXTENSIONS = {'.mp4', '.m4v', '.mov', '.avi', '.mkv', '.flv', '.wmv'}
+    SUPPORTED_EXTENSIONS = frozenset({'.mp4', '.m4v', '.mov', '.avi', '.mkv', '.flv', '.wmv'})
+    
+    # Same extensions for a single str.endswith check on lowercased paths
+    _SUPPORTED_SUFFIX_TUPLE = tuple(sorted(SUPPORTED_EXTENSIONS))
+    
+    # Seconds a free space reading is reused by check_disk_space
+    DISK_USAGE_TTL = 1.0
     
     def __init__(self):
         self.logger = None  # Will be set by the application
+        self._dir_dialog = None  # (parent, QFileDialog) of select_output_directory
+        self._disk_usage_cache: Dict[str, Tuple[float, int]] = {}  # directory: (expiry, free bytes)
+        self._stat_cache: Dict[str, os.stat_result] = {}  # path: stat of a validated file
     
     def set_logger(self, logger):
         """Set logger instance."""
@@ -35,14 +46,134 @@ class FileManager:
         valid_files = []
         invalid_files = []
         
+        # Bound once for the loop, which runs for every dropped file
+        check = self.check_input_file
+        valid_append = valid_files.append
+        logger = self.logger
+        
         for file_path in file_paths:
-            try:
-                self._validate_single_file(file_path)
-                valid_files.append(file_path)
-            except FileValidationError as e:
+            ok, reason = check(file_path)
+            if ok:
+                valid_append(file_path)
+            else:
                 invalid_files.append(file_path)
+                if logger:
+                    logger.warning("Invalid file: %s - %s", file_path, reason)
+        
+        return valid_files, invalid_files
+    
+    def check_input_file(self, file_path: str) -> Tuple[bool, str]:
+        """
+        Check a single input file without raising.
+        
+        Invalid files are ordinary user input (e.g. a dropped folder with
+        mixed content), so they are reported as a result instead of an
+        exception. The extension is checked first so that most rejected
+        files never hit the filesystem.
+        
+        Args:
+            file_path (str): File path to check
+            
+        Returns:
+            Tuple[bool, str]: (is_valid, reason); reason is empty for valid files
+        """
+        if not file_path.lower().endswith(self._SUPPORTED_SUFFIX_TUPLE):
+            return False, f"サポートされていないファイル形式です: {os.path.splitext(file_path)[1]}"
+        
+        try:
+            file_stat = os.stat(file_path)
+        except OSError:
+            return False, f"ファイルが存在しません: {file_path}"
+        
+        result = self._check_file_stat(file_path, file_stat)
+        if result[0]:
+            self._stat_cache[file_path] = file_stat
+        return result
+    
+    def _stat(self, file_path: str) -> os.stat_result:
+        """
+        Stat a file, reusing the result of an earlier successful validation.
+        
+        Args:
+            file_path (str): File path
+            
+        Returns:
+            os.stat_result: Cached or fresh stat result
+            
+        Raises:
+            OSError: If the file cannot be stat'ed
+        """
+        file_stat = self._stat_cache.get(file_path)
+        if file_stat is None:
+            file_stat = os.stat(file_path)
+        return file_stat
+    
+    def clear_stat_cache(self) -> None:
+        """Forget the stat results kept from validation."""
+        self._stat_cache.clear()
+    
+    def _check_file_stat(self, file_path: str, file_stat: os.stat_result) -> Tuple[bool, str]:
+        """
+        Check the stat result of a file with a supported extension.
+        
+        Args:
+            file_path (str): File path, for the reason text
+            file_stat (os.stat_result): Result of a stat call that followed symlinks
+            
+        Returns:
+            Tuple[bool, str]: (is_valid, reason); reason is empty for valid files
+        """
+        # Check if it's a file (not directory)
+        if not S_ISREG(file_stat.st_mode):
+            return False, f"ファイルではありません: {file_path}"
+        
+        # Check file size (minimum 1KB, maximum 10GB)
+        if file_stat.st_size < 1024:  # Less than 1KB
+            return False, f"ファイルが小さすぎます: {file_path}"
+        if file_stat.st_size > 10 * 1024 * 1024 * 1024:  # More than 10GB
+            return False, f"ファイルが大きすぎます: {file_path}"
+        
+        return True, ""
+    
+    def validate_direntries(self, entries: Iterable[os.DirEntry]) -> Tuple[List[str], List[str]]:
+        """
+        Validate the entries of a directory scan.
+        
+        Prefer this over ``validate_input_files`` when the paths come from
+        ``os.scandir``: entries are filtered by name and by the file type
+        reported with the directory listing, so only candidate videos are
+        stat'ed, and on Windows ``DirEntry.stat`` needs no system call at all.
+        Entries that are not files, or not videos, are skipped rather than
+        reported as invalid.
+        
+        Args:
+            entries (Iterable[os.DirEntry]): Entries, e.g. from ``os.scandir``
+            
+        Returns:
+            Tuple[List[str], List[str]]: (valid_files, invalid_files)
+        """
+        valid_files = []
+        invalid_files = []
+        
+        for entry in entries:
+            if not entry.name.lower().endswith(self._SUPPORTED_SUFFIX_TUPLE):
+                continue
+            try:
+                if not entry.is_file():
+                    continue
+                file_stat = entry.stat()
+            except OSError:
+                ok, reason = False, f"ファイルが存在しません: {entry.path}"
+            else:
+                ok, reason = self._check_file_stat(entry.path, file_stat)
+            
+            if ok:
+                self._stat_cache[entry.path] = file_stat
+                valid_files.append(entry.path)
+            else:
+                invalid_files.append(entry.path)
                 if self.logger:
-                    self.logger.warning(f"Invalid file: {file_path} - {e}")
+                    self.logger.warning("Invalid file: %s - %s", entry.path, reason)
         
         return valid_files, invalid_files
     
@@ -56,29 +187,9 @@ class FileManager:
         Raises:
             FileValidationError: If file is invalid
         """
-        path = Path(file_path)
-        
-        # Check if file exists
-        if not path.exists():
-            raise FileValidationError(f"ファイルが存在しません: {file_path}", file_path)
-        
-        # Check if it's a file (not directory)
-        if not path.is_file():
-            raise FileValidationError(f"ファイルではありません: {file_path}", file_path)
-        
-        # Check file extension
-        if path.suffix.lower() not in self.SUPPORTED_EXTENSIONS:
-            raise FileValidationError(
-                f"サポートされていないファイル形式です: {path.suffix}", 
-                file_path
-            )
-        
-        # Check file size (minimum 1KB, maximum 10GB)
-        file_size = path.stat().st_size
-        if file_size < 1024:  # Less than 1KB
-            raise FileValidationError(f"ファイルが小さすぎます: {file_path}", file_path)
-        if file_size > 10 * 1024 * 1024 * 1024:  # More than 10GB
-            raise FileValidationError(f"ファイルが大きすぎます: {file_path}", file_path)
+        ok, reason = self.check_input_file(file_path)
+        if not ok:
+            raise FileValidationError(reason, file_path)
     
     def select_output_directory(self, parent=None) -> Optional[str]:
         """
@@ -92,10 +203,15 @@ class FileManager:
         """
         from PyQt6.QtWidgets import QFileDialog
         
-        dialog = QFileDialog(parent)
-        dialog.setFileMode(QFileDialog.FileMode.Directory)
-        dialog.setOption(QFileDialog.Option.ShowDirsOnly, True)
-        dialog.setWindowTitle("出力フォルダを選択")
+        # The dialog is slow to build, so it is kept for later calls with
+        # the same parent
+        if self._dir_dialog is None or self._dir_dialog[0] is not parent:
+            dialog = QFileDialog(parent)
+            dialog.setFileMode(QFileDialog.FileMode.Directory)
+            dialog.setOption(QFileDialog.Option.ShowDirsOnly, True)
+            dialog.setWindowTitle("出力フォルダを選択")
+            self._dir_dialog = (parent, dialog)
+        dialog = self._dir_dialog[1]
         
         if dialog.exec():
             selected_dirs = dialog.selectedFiles()
@@ -117,19 +233,81 @@ class FileManager:
         Returns:
             str: Generated output filename
         """
-        input_path_obj = Path(input_path)
-        original_name = input_path_obj.stem
+        return self.compile_output_namer(naming_pattern, suffix)(input_path)
+    
+    def compile_output_namer(self, naming_pattern: str,
+                             suffix: str = "_converted") -> Callable[[str], str]:
+        """
+        Build an output filename function for a fixed naming pattern.
         
-        # Replace placeholders in pattern
-        output_name = naming_pattern.replace('{original}', original_name)
-        output_name = output_name.replace('{suffix}', suffix)
+        The pattern is split around ``{original}`` once, so naming a file is
+        a single ``str.join``. A bare ``{original}`` pattern, which would
+        reproduce the input name, gets the suffix appended up front.
+        
+        Args:
+            naming_pattern (str): Naming pattern
+            suffix (str): File suffix
+            
+        Returns:
+            Callable[[str], str]: Maps an input path to its output filename
+        """
+        pattern = naming_pattern.replace('{suffix}', suffix)
+        if pattern == '{original}':
+            pattern += suffix
+        parts = pattern.split('{original}')
         
-        # Ensure we have a valid filename
-        if not output_name or output_name == original_name:
-            output_name = f"{original_name}{suffix}"
+        def output_filename(input_path: str) -> str:
+            original_name = os.path.splitext(os.path.basename(input_path))[0]
+            
+            # Replace placeholders in pattern
+            output_name = original_name.join(parts)
+            
+            # Ensure we have a valid filename
+            if not output_name or output_name == original_name:
+                output_name = f"{original_name}{suffix}"
+            
+            # Add .mp3 extension
+            return f"{output_name}.mp3"
         
-        # Add .mp3 extension
-        return f"{output_name}.mp3"
+        return output_filename
+    
+    def assign_output_filenames(self, files: List[Dict[str, Any]], output_dir: str,
+                                output_namer: Callable[[str], str]) -> List[Dict[str, Any]]:
+        """
+        Assign a unique output filename to each file of a batch.
+        
+        Names already present in ``output_dir`` or taken by an earlier file
+        of the batch get a " (n)" suffix. The directory is listed once and
+        names are compared case-insensitively, as on the default macOS
+        file system.
+        
+        Args:
+            files (List[Dict[str, Any]]): File dicts with an ``input_path``
+            output_dir (str): Output directory
+            output_namer (Callable[[str], str]): From ``compile_output_namer``
+            
+        Returns:
+            List[Dict[str, Any]]: Copies of the dicts with ``output_filename``
+        """
+        try:
+            taken = {name.lower() for name in os.listdir(output_dir)}
+        except OSError:
+            taken = set()
+        
+        named = []
+        for file_info in files:
+            filename = output_namer(file_info['input_path'])
+            if filename.lower() in taken:
+                stem, ext = os.path.splitext(filename)
+                counter = 1
+                while f"{stem} ({counter}){ext}".lower() in taken:
+                    counter += 1
+                filename = f"{stem} ({counter}){ext}"
+            
+            taken.add(filename.lower())
+            named.append({**file_info, 'output_filename': filename})
+        
+        return named
     
     def check_disk_space(self, directory: str, required_bytes: int) -> bool:
         """
@@ -146,8 +324,14 @@ class FileManager:
             DiskSpaceError: If insufficient space
         """
         try:
-            stat = shutil.disk_usage(directory)
-            available_bytes = stat.free
+            # Checks for a batch hit the same directory; reuse a recent reading
+            now = time.monotonic()
+            cached = self._disk_usage_cache.get(directory)
+            if cached is not None and cached[0] > now:
+                available_bytes = cached[1]
+            else:
+                available_bytes = shutil.disk_usage(directory).free
+                self._disk_usage_cache[directory] = (now + self.DISK_USAGE_TTL, available_bytes)
             
             if available_bytes < required_bytes:
                 raise DiskSpaceError(
@@ -161,6 +345,28 @@ class FileManager:
         except OSError as e:
             raise OutputDirectoryError(f"Cannot access directory: {directory}")
     
+    def stat_inputs(self, files: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Stat each input file once for a batch.
+        
+        Args:
+            files (List[Dict[str, Any]]): File dicts with an ``input_path``
+            
+        Returns:
+            List[Dict[str, Any]]: Copies of the dicts; ``input_stat`` holds the
+            ``os.stat_result`` for inputs that exist and is missing otherwise
+        """
+        stated = []
+        for file_info in files:
+            file_info = dict(file_info)
+            try:
+                file_info['input_stat'] = os.stat(file_info['input_path'])
+            except OSError:
+                pass
+            stated.append(file_info)
+        
+        return stated
+    
     def get_file_size_mb(self, file_path: str) -> float:
         """
         Get file size in megabytes.
@@ -172,7 +378,7 @@ class FileManager:
             float: File size in MB
         """
         try:
-            return os.path.getsize(file_path) / (1024 * 1024)
+            return self._stat(file_path).st_size / (1024 * 1024)
         except OSError:
             return 0.0
     
@@ -186,29 +392,31 @@ class FileManager:
         Returns:
             dict: File information
         """
+        name = os.path.basename(file_path)
+        path = os.path.abspath(file_path)
         try:
-            path = Path(file_path)
-            stat = path.stat()
-            
-            return {
-                'name': path.name,
-                'path': str(path.absolute()),
-                'size_bytes': stat.st_size,
-                'size_mb': round(stat.st_size / (1024 * 1024), 2),
-                'modified_time': stat.st_mtime,
-                'extension': path.suffix.lower(),
-                'is_valid': path.suffix.lower() in self.SUPPORTED_EXTENSIONS
-            }
+            file_stat = self._stat(file_path)
         except OSError:
             return {
-                'name': Path(file_path).name,
-                'path': str(Path(file_path).absolute()),
+                'name': name,
+                'path': path,
                 'size_bytes': 0,
                 'size_mb': 0.0,
                 'modified_time': 0,
                 'extension': '',
                 'is_valid': False
             }
+        
+        extension = os.path.splitext(name)[1].lower()
+        return {
+            'name': name,
+            'path': path,
+            'size_bytes': file_stat.st_size,
+            'size_mb': round(file_stat.st_size / (1024 * 1024), 2),
+            'modified_time': file_stat.st_mtime,
+            'extension': extension,
+            'is_valid': extension in self.SUPPORTED_EXTENSIONS
+        }
     
     def create_output_directory(self, directory: str) -> None:
         """
@@ -236,15 +444,39 @@ class FileManager:
             bool: Success status
         """
         try:
-            Path(file_path).unlink()
+            os.unlink(file_path)
             if self.logger:
-                self.logger.info(f"Deleted file: {file_path}")
+                self.logger.info("Deleted file: %s", file_path)
             return True
         except OSError as e:
             if self.logger:
-                self.logger.error(f"Failed to delete file {file_path}: {e}")
+                self.logger.error("Failed to delete file %s: %s", file_path, e)
             return False
     
+    def delete_files(self, file_paths: List[str]) -> Tuple[int, int]:
+        """
+        Delete several files, logging one summary instead of a line per file.
+        
+        Use ``delete_file_safely`` when each deletion should be logged.
+        
+        Args:
+            file_paths (List[str]): File paths to delete
+            
+        Returns:
+            Tuple[int, int]: (deleted_count, failed_count)
+        """
+        deleted = failed = 0
+        for file_path in file_paths:
+            try:
+                os.unlink(file_path)
+                deleted += 1
+            except OSError:
+                failed += 1
+        
+        if self.logger and (deleted or failed):
+            self.logger.info("Deleted %d files (%d failed)", deleted, failed)
+        return deleted, failed
+    
     def open_file_location(self, file_path: str) -> bool:
         """
         Open file location in Finder.
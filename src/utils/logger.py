@@ -2,10 +2,21 @@
 Logger utility for MP4 to MP3 Converter application.
 """
 
+import atexit
 import logging
+import logging.handlers
 import os
+import queue
 from pathlib import Path
-from datetime import datetime
+
+
+class _LogFileHandler(logging.handlers.TimedRotatingFileHandler):
+    """Rotates at midnight and creates the log directory with the first record."""
+    
+    def _open(self):
+        """Open the log file, creating its directory first."""
+        os.makedirs(os.path.dirname(self.baseFilename), exist_ok=True)
+        return super()._open()
 
 
 def setup_logger(name="mp4_to_mp3_converter", log_level=logging.INFO):
@@ -19,19 +30,24 @@ def setup_logger(name="mp4_to_mp3_converter", log_level=logging.INFO):
     Returns:
         logging.Logger: Configured logger instance
     """
-    # Create logs directory if it doesn't exist
+    # Created on the first record, see _LogFileHandler
     logs_dir = Path.home() / "Library" / "Logs" / "MP4toMP3Converter"
-    logs_dir.mkdir(parents=True, exist_ok=True)
+    log_file = logs_dir / "conversion.log"
     
-    # Create log filename with timestamp
-    timestamp = datetime.now().strftime("%Y%m%d")
-    log_file = logs_dir / f"conversion_{timestamp}.log"
+    # No format uses thread or process fields; skip collecting them per record
+    logging.logThreads = False
+    logging.logProcesses = False
+    logging.logMultiprocessing = False
     
     # Create logger
     logger = logging.getLogger(name)
     logger.setLevel(log_level)
     
-    # Clear existing handlers
+    # Clear existing handlers, stopping the listener of a previous setup
+    previous_listener = getattr(logger, '_listener', None)
+    if previous_listener is not None:
+        previous_listener.stop()
+        atexit.unregister(previous_listener.stop)
     logger.handlers.clear()
     
     # Create formatters
@@ -43,8 +59,11 @@ def setup_logger(name="mp4_to_mp3_converter", log_level=logging.INFO):
         '%(levelname)s: %(message)s'
     )
     
-    # File handler
-    file_handler = logging.FileHandler(log_file, encoding='utf-8')
+    # File handler; the file is opened with the first record and rotated
+    # at midnight, keeping two weeks of logs
+    file_handler = _LogFileHandler(
+        log_file, when='midnight', backupCount=14, encoding='utf-8', delay=True
+    )
     file_handler.setLevel(logging.DEBUG)
     file_handler.setFormatter(file_formatter)
     
@@ -53,9 +72,18 @@ def setup_logger(name="mp4_to_mp3_converter", log_level=logging.INFO):
     console_handler.setLevel(log_level)
     console_handler.setFormatter(console_formatter)
     
-    # Add handlers to logger
-    logger.addHandler(file_handler)
-    logger.addHandler(console_handler)
+    # The calling thread merges the message arguments (QueueHandler.prepare)
+    # and enqueues the record; a listener thread applies the handler formats
+    # and writes it, so conversion threads never wait on the log file
+    log_queue = queue.SimpleQueue()
+    listener = logging.handlers.QueueListener(
+        log_queue, file_handler, console_handler, respect_handler_level=True
+    )
+    listener.start()
+    atexit.register(listener.stop)  # flushes queued records at exit
+    
+    logger.addHandler(logging.handlers.QueueHandler(log_queue))
+    logger._listener = listener  # keeps the listener alive with the logger
     
     return logger
 
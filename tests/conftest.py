@@ -2,71 +2,105 @@
 Test configuration and fixtures for MP4 to MP3 Converter tests.
 """
 
-import pytest
-import tempfile
+import logging
 import os
-from pathlib import Path
+import sys
+from collections import namedtuple
+import pytest
 from unittest.mock import Mock
 
+_SRC = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src'))
+if _SRC not in sys.path:
+    sys.path.insert(0, _SRC)
+
+from PyQt6.QtCore import QSettings
+
+import config.settings
+from config.settings import Settings
+from utils.file_manager import FileManager
+
+
+# Application objects shared by the integration tests
+AppStack = namedtuple('AppStack', ['settings', 'file_manager', 'logger'])
+
+
+@pytest.fixture(scope="session", autouse=True)
+def settings_store(tmp_path_factory):
+    """
+    Keep every Settings of the session in a temporary ini file.
+    
+    Nothing reads or writes the user's store, and each xdist worker gets its
+    own file, so parallel workers cannot see each other's values.
+    """
+    path = str(tmp_path_factory.mktemp("settings") / "settings.ini")
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(config.settings, 'QSettings',
+                   lambda organization, application: QSettings(path, QSettings.Format.IniFormat))
+        yield path
+
 
 @pytest.fixture
-def temp_dir():
-    """Create a temporary directory for tests."""
-    temp_path = tempfile.mkdtemp()
-    yield temp_path
-    # Cleanup
-    import shutil
-    shutil.rmtree(temp_path, ignore_errors=True)
+def temp_dir(tmp_path):
+    """Create a temporary directory for tests (cleaned up by pytest)."""
+    return str(tmp_path)
+
+
+# Values returned by mock_settings
+_SETTINGS = {
+    'audio_quality': '192',
+    'output_directory': '/tmp/output',
+    'file_naming_pattern': '{original}_converted',
+    'output_suffix': '_converted',
+    'auto_open_folder': True,
+    'delete_original': False,
+    'max_concurrent_conversions': 4,
+    'preserve_metadata': True,
+    'volume_normalization': False,
+    'fade_in': 0,
+    'fade_out': 0,
+}
 
 
 @pytest.fixture
 def mock_settings():
     """Create mock settings object."""
     settings = Mock()
-    settings.get.side_effect = lambda key, default=None: {
-        'audio_quality': '192',
-        'output_directory': '/tmp/output',
-        'file_naming_pattern': '{original}_converted',
-        'output_suffix': '_converted',
-        'auto_open_folder': True,
-        'delete_original': False,
-        'max_concurrent_conversions': 4,
-        'preserve_metadata': True,
-        'volume_normalization': False,
-        'fade_in': 0,
-        'fade_out': 0,
-    }.get(key, default)
+    # The real dict method, so reads are neither tracked nor rebuilt per call
+    settings.get = _SETTINGS.get
     return settings
 
 
-@pytest.fixture
-def sample_mp4_file(temp_dir):
-    """Create a sample MP4 file for testing."""
-    mp4_path = os.path.join(temp_dir, "sample_video.mp4")
+@pytest.fixture(scope="session")
+def sample_mp4_file(tmp_path_factory):
+    """Create a sample MP4 file, shared by the session; do not modify it."""
+    mp4_path = tmp_path_factory.mktemp("samples") / "sample_video.mp4"
     # Create a small dummy file (not a real MP4, but sufficient for file operations)
-    with open(mp4_path, 'wb') as f:
-        f.write(b'dummy mp4 content' * 1000)  # ~17KB file
-    return mp4_path
+    mp4_path.write_bytes(b'dummy mp4 content' * 1000)  # ~17KB file
+    return str(mp4_path)
 
 
-@pytest.fixture
-def unsupported_file(temp_dir):
-    """Create an unsupported file for testing."""
-    txt_path = os.path.join(temp_dir, "document.txt")
-    with open(txt_path, 'w') as f:
-        f.write("This is a text file, not a video file.")
-    return txt_path
+@pytest.fixture(scope="session")
+def unsupported_file(tmp_path_factory):
+    """Create an unsupported file, shared by the session; do not modify it."""
+    txt_path = tmp_path_factory.mktemp("samples") / "document.txt"
+    txt_path.write_text("This is a text file, not a video file.")
+    return str(txt_path)
+
+
+class _StubFFmpeg:
+    """FFmpegWrapper stand-in with canned results and no spec introspection."""
+    
+    def convert_mp4_to_mp3(self, *args, **kwargs):
+        return True
+    
+    def get_ffmpeg_version(self):
+        return "ffmpeg version 5.1.0"
 
 
 @pytest.fixture
 def mock_ffmpeg_wrapper():
-    """Create a mock FFmpegWrapper."""
-    from converter.ffmpeg_wrapper import FFmpegWrapper
-    
-    wrapper = Mock(spec=FFmpegWrapper)
-    wrapper.convert_mp4_to_mp3.return_value = True
-    wrapper.get_ffmpeg_version.return_value = "ffmpeg version 5.1.0"
-    return wrapper
+    """Create a stub FFmpegWrapper (use Mock(spec=...) to assert calls)."""
+    return _StubFFmpeg()
 
 
 @pytest.fixture
@@ -77,4 +111,32 @@ def mock_logger():
     logger.error = Mock()
     logger.warning = Mock()
     logger.debug = Mock()
-    return logger
\ No newline at end of file
+    return logger
+
+
+@pytest.fixture(scope="session")
+def test_logger():
+    """Create a real logger that writes no log file (records still reach caplog)."""
+    logger = logging.getLogger("test")
+    logger.handlers[:] = [logging.NullHandler()]
+    return logger
+
+
+@pytest.fixture(scope="session")
+def app_settings(settings_store):
+    """
+    Create the one Settings shared by the session's fixtures.
+    
+    Backed by ``settings_store``; sharing the instance keeps its in-memory
+    cache from drifting apart from another instance's. Tests that change
+    settings must restore them.
+    """
+    return Settings()
+
+
+@pytest.fixture(scope="package")
+def app_stack(test_logger, app_settings):
+    """Create the settings, file manager and logger once for the test package."""
+    file_manager = FileManager()
+    file_manager.set_logger(test_logger)
+    return AppStack(app_settings, file_manager, test_logger)
\ No newline at end of file
@@ -3,24 +3,50 @@ Test suite for MP4 to MP3 Converter application.
 """
 
 import pytest
-import tempfile
 import os
+import shutil
+import sys
 from pathlib import Path
 from unittest.mock import Mock, patch, MagicMock
 
-# Add src to path for imports
-import sys
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+# Add src to path for imports, once even if the module is imported again
+_SRC = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src'))
+if _SRC not in sys.path:
+    sys.path.insert(0, _SRC)
 
 from exceptions import (
     ConversionError, FileValidationError, FFmpegNotFoundError, 
     DiskSpaceError, ConversionCancelledError
 )
 from utils.file_manager import FileManager
-from utils.logger import setup_logger
 from config.settings import Settings
-from converter.ffmpeg_wrapper import FFmpegWrapper
-from converter.conversion_manager import ConversionManager, ConversionWorker
+from converter.ffmpeg_wrapper import FFmpegWrapper, find_ffmpeg
+from converter.conversion_manager import (
+    ConversionManager, ConversionWorker, snapshot_settings
+)
+from gui.file_list_model import (
+    FileListModel, ProgressRole, StatusRole, STATUS_CONVERTING, STATUS_FAILED
+)
+
+
+# Settings read by the conversion manager and worker tests
+_SETTINGS_MAP = {
+    'audio_quality': '192',
+    'max_concurrent_conversions': 4,
+    'output_directory': '/tmp/output',
+    'file_naming_pattern': '{original}_converted',
+    'output_suffix': '_converted',
+    'preserve_metadata': True,
+    'volume_normalization': False,
+    'delete_original': False,
+}
+
+
+class _StubSettings(dict):
+    """Settings stand-in for the conversion tests; ``get`` is plain ``dict.get``."""
+    
+    def get_output_directory(self):
+        return self['output_directory']
 
 
 class TestExceptions:
@@ -45,41 +71,70 @@ class TestExceptions:
         error = FFmpegNotFoundError("FFmpeg not found")
         assert str(error) == "FFmpeg not found"
         assert error.user_message == "FFmpegがインストールされていません"
+    
+    def test_user_message_can_be_overridden(self):
+        """Test that an instance can override the class user message."""
+        error = DiskSpaceError("No space", 100, 10)
+        error.user_message = "カスタムメッセージ"
+        assert error.user_message == "カスタムメッセージ"
+        assert DiskSpaceError.user_message == "保存先に十分な空き容量がありません"
+        assert error.required_space == 100
 
 
 class TestFileManager:
     """Test FileManager class."""
     
+    @pytest.fixture(scope="class", autouse=True)
+    @classmethod
+    def class_temp_dir(cls, tmp_path_factory):
+        """Create one temporary directory for the class (cleaned up by pytest)."""
+        cls.temp_dir = str(tmp_path_factory.mktemp("file_manager"))
+    
     def setup_method(self):
         """Setup test fixtures."""
         self.file_manager = FileManager()
-        self.temp_dir = tempfile.mkdtemp()
-    
-    def teardown_method(self):
-        """Cleanup test fixtures."""
-        import shutil
-        shutil.rmtree(self.temp_dir, ignore_errors=True)
     
     def test_validate_supported_extensions(self):
         """Test validation of supported file extensions."""
         # Create test files
-        test_files = [
-            os.path.join(self.temp_dir, "test.mp4"),
-            os.path.join(self.temp_dir, "test.m4v"),
-            os.path.join(self.temp_dir, "test.mov"),
-            os.path.join(self.temp_dir, "test.txt"),  # Unsupported
-            os.path.join(self.temp_dir, "test.avi"),
-        ]
+        names = ("test.mp4", "test.m4v", "test.mov", "test.txt", "test.avi")  # .txt unsupported
+        test_files = [os.path.join(self.temp_dir, name) for name in names]
         
-        # Create actual files
+        # Create actual files, sparse and just large enough to be accepted
         for file_path in test_files:
-            Path(file_path).touch()
+            fd = os.open(file_path, os.O_CREAT | os.O_WRONLY, 0o600)
+            os.ftruncate(fd, 1024)
+            os.close(fd)
         
         valid_files, invalid_files = self.file_manager.validate_input_files(test_files)
         
         assert len(valid_files) == 4  # All except .txt
         assert len(invalid_files) == 1  # Only .txt
-        assert os.path.join(self.temp_dir, "test.txt") in invalid_files
+        assert test_files[3] in invalid_files
+    
+    @pytest.fixture(scope="class")
+    @classmethod
+    def extension_files(cls, tmp_path_factory):
+        """Create one file per tested extension, once for the class."""
+        directory = tmp_path_factory.mktemp("extensions")
+        files = {}
+        for ext in (".mp4", ".m4v", ".mov", ".avi", ".txt"):
+            files[ext] = str(directory / f"video{ext}")
+            fd = os.open(files[ext], os.O_CREAT | os.O_WRONLY, 0o600)
+            os.ftruncate(fd, 1024)
+            os.close(fd)
+        return files
+    
+    @pytest.mark.parametrize("ext, valid", [
+        (".mp4", True), (".m4v", True), (".mov", True), (".avi", True), (".txt", False),
+    ])
+    def test_validate_single_file_extension(self, extension_files, ext, valid):
+        """Test validation of each file extension on its own."""
+        if valid:
+            self.file_manager._validate_single_file(extension_files[ext])
+        else:
+            with pytest.raises(FileValidationError):
+                self.file_manager._validate_single_file(extension_files[ext])
     
     def test_validate_nonexistent_file(self):
         """Test validation of non-existent file."""
@@ -88,6 +143,49 @@ class TestFileManager:
         with pytest.raises(FileValidationError):
             self.file_manager._validate_single_file(nonexistent_file)
     
+    def test_check_input_file(self):
+        """Test that invalid files are reported without raising."""
+        valid_file = os.path.join(self.temp_dir, "valid.mp4")
+        with open(valid_file, 'wb') as f:
+            f.write(b"\0" * 2048)
+        
+        assert self.file_manager.check_input_file(valid_file) == (True, "")
+        
+        ok, reason = self.file_manager.check_input_file(os.path.join(self.temp_dir, "notes.txt"))
+        assert not ok
+        assert ".txt" in reason
+        
+        ok, reason = self.file_manager.check_input_file(os.path.join(self.temp_dir, "missing.mp4"))
+        assert not ok
+        assert "存在しません" in reason
+    
+    def test_validate_direntries(self):
+        """Test validation of directory scan entries."""
+        # Own directory, as the class directory holds other tests' files
+        scan_dir = os.path.join(self.temp_dir, "scan")
+        os.mkdir(scan_dir)
+        for name, size in (("a.mp4", 2048), ("b.mov", 10), ("notes.txt", 2048)):
+            with open(os.path.join(scan_dir, name), 'wb') as f:
+                f.write(b"\0" * size)
+        os.mkdir(os.path.join(scan_dir, "folder.mp4"))
+        
+        with os.scandir(scan_dir) as entries:
+            valid_files, invalid_files = self.file_manager.validate_direntries(entries)
+        
+        assert valid_files == [os.path.join(scan_dir, "a.mp4")]
+        assert invalid_files == [os.path.join(scan_dir, "b.mov")]
+    
+    def test_check_disk_space_reuses_recent_reading(self):
+        """Test that free space is read once within the TTL."""
+        usage = Mock(free=1000)
+        with patch('utils.file_manager.shutil.disk_usage', return_value=usage) as disk_usage:
+            assert self.file_manager.check_disk_space(self.temp_dir, 500)
+            assert self.file_manager.check_disk_space(self.temp_dir, 800)
+            with pytest.raises(DiskSpaceError):
+                self.file_manager.check_disk_space(self.temp_dir, 2000)
+        
+        assert disk_usage.call_count == 1
+    
     def test_generate_output_filename(self):
         """Test output filename generation."""
         input_path = "/path/to/input.mp4"
@@ -99,12 +197,61 @@ class TestFileManager:
         )
         
         assert output_filename == "input_converted.mp3"
+        
+        namer = self.file_manager.compile_output_namer("{original}", "_audio")
+        assert namer(input_path) == "input_audio.mp3"
+        namer = self.file_manager.compile_output_namer("{original}-{original}{suffix}", "_a")
+        assert namer(input_path) == "input-input_a.mp3"
+    
+    def test_stat_inputs(self):
+        """Test batch inputs are stat()ed once without mutating the input."""
+        existing = os.path.join(self.temp_dir, "test.mp4")
+        with open(existing, 'w') as f:
+            f.write("x" * 2048)
+        files = [
+            {'input_path': existing},
+            {'input_path': os.path.join(self.temp_dir, "missing.mp4")},
+        ]
+        
+        stated = self.file_manager.stat_inputs(files)
+        
+        assert stated[0]['input_stat'].st_size == 2048
+        assert 'input_stat' not in stated[1]
+        assert 'input_stat' not in files[0]
+    
+    def test_assign_output_filenames_resolves_collisions(self):
+        """Test outputs never collide with existing files or each other."""
+        with open(os.path.join(self.temp_dir, "Video.mp3"), 'w') as f:
+            f.write("existing")
+        files = [
+            {'input_path': '/a/video.mp4'},
+            {'input_path': '/b/video.mp4'},
+            {'input_path': '/a/other.mp4'},
+        ]
+        namer = self.file_manager.compile_output_namer('{original}', '')
+        
+        named = self.file_manager.assign_output_filenames(files, self.temp_dir, namer)
+        
+        assert [f['output_filename'] for f in named] == [
+            "video (1).mp3", "video (2).mp3", "other.mp3"
+        ]
+    
+    def test_delete_files(self):
+        """Test batch deletion counts deleted and failed files."""
+        existing = os.path.join(self.temp_dir, "done.mp4")
+        Path(existing).touch()
+        missing = os.path.join(self.temp_dir, "missing.mp4")
+        
+        assert self.file_manager.delete_files([existing, missing]) == (1, 1)
+        assert not os.path.exists(existing)
     
     def test_get_file_info(self):
         """Test getting file information."""
         test_file = os.path.join(self.temp_dir, "test.mp4")
-        with open(test_file, 'w') as f:
-            f.write("test content" * 1000)  # Create file with content
+        # Sparse file; large enough for a non-zero size in MB at 2 decimals
+        fd = os.open(test_file, os.O_CREAT | os.O_WRONLY, 0o600)
+        os.ftruncate(fd, 12000)
+        os.close(fd)
         
         file_info = self.file_manager.get_file_info(test_file)
         
@@ -113,29 +260,99 @@ class TestFileManager:
         assert file_info['size_mb'] > 0
         assert file_info['extension'] == ".mp4"
         assert file_info['is_valid'] is True
+    
+    def test_stat_cache(self):
+        """Test reuse of validation stat results."""
+        test_file = os.path.join(self.temp_dir, "cached.mp4")
+        with open(test_file, 'wb') as f:
+            f.write(b'\0' * 2048)
+        
+        self.file_manager.validate_input_files([test_file])
+        with open(test_file, 'ab') as f:
+            f.write(b'\0' * 2048)
+        
+        assert self.file_manager.get_file_info(test_file)['size_bytes'] == 2048
+        self.file_manager.clear_stat_cache()
+        assert self.file_manager.get_file_info(test_file)['size_bytes'] == 4096
 
 
 class TestSettings:
     """Test Settings class."""
     
-    def setup_method(self):
-        """Setup test fixtures."""
-        self.settings = Settings()
+    @pytest.fixture(scope="class", autouse=True)
+    @classmethod
+    def class_settings(cls, app_settings):
+        """Share the session's Settings instance with the class."""
+        cls.settings = app_settings
+    
+    def teardown_method(self):
+        """Drop the signal connections made by the test."""
+        try:
+            self.settings.settings_changed.disconnect()
+        except TypeError:  # nothing was connected
+            pass
     
     def test_default_settings(self):
         """Test that default settings are applied."""
         assert self.settings.get('audio_quality') == '192'
         assert self.settings.get('auto_open_folder') is True
-        assert self.settings.get('max_concurrent_conversions') == 4
+        assert self.settings.get('max_concurrent_conversions') == min(os.cpu_count() or 1, 8)
     
     def test_setting_and_getting_values(self):
         """Test setting and getting values."""
-        self.settings.set('audio_quality', '320')
-        assert self.settings.get('audio_quality') == '320'
-        
-        self.settings.set('auto_open_folder', False)
-        assert self.settings.get('auto_open_folder') is False
-    
+        orig = self.settings.get_many(['audio_quality', 'auto_open_folder'])
+        try:
+            self.settings.set('audio_quality', '320')
+            assert self.settings.get('audio_quality') == '320'
+            
+            self.settings.set('auto_open_folder', False)
+            assert self.settings.get('auto_open_folder') is False
+        finally:
+            self.settings.set_many(orig)
+
+    def test_set_only_emits_on_change(self):
+        """Test that setting an unchanged value is a no-op."""
+        changes = []
+        self.settings.settings_changed.connect(lambda key, value: changes.append(key))
+
+        self.settings.set('fade_in', 3)
+        self.settings.set('fade_in', 3)
+        self.settings.set('fade_in', 0)
+
+        assert changes == ['fade_in', 'fade_in']
+
+    def test_import_settings_emits_once(self, temp_dir):
+        """Test that importing settings emits a single aggregated change."""
+        path = os.path.join(temp_dir, "settings.json")
+        self.settings.set('fade_out', 0)
+        assert self.settings.export_settings(path)
+
+        other = Settings()
+        orig = other.get_many(Settings.DEFAULTS)
+        try:
+            other.set('fade_out', 5)
+            other.set('fade_in', 2)
+            changes = []
+            other.settings_changed.connect(lambda key, value: changes.append(key))
+
+            assert other.import_settings(path)
+            assert other.get('fade_out') == 0
+            assert changes == [Settings.ALL_KEYS]
+        finally:
+            other.set_many(orig)
+
+    def test_get_and_set_many(self):
+        """Test batched reads and writes."""
+        changes = []
+        self.settings.settings_changed.connect(lambda key, value: changes.append(key))
+
+        assert self.settings.set_many({'fade_in': 3, 'fade_out': 4, 'unknown': 1})
+        assert changes == [Settings.ALL_KEYS]
+        assert self.settings.get_many(['fade_in', 'fade_out']) == {'fade_in': 3, 'fade_out': 4}
+        assert not self.settings.set_many({'fade_in': 3})
+        assert changes == [Settings.ALL_KEYS]
+        self.settings.set_many({'fade_in': 0, 'fade_out': 0})
+
     def test_audio_quality_options(self):
         """Test audio quality options."""
         options = self.settings.get_audio_quality_options()
@@ -153,39 +370,47 @@ class TestSettings:
 class TestFFmpegWrapper:
     """Test FFmpegWrapper class."""
     
+    @pytest.fixture(scope="class", autouse=True)
+    @classmethod
+    def class_temp_dir(cls, tmp_path_factory):
+        """Create one temporary directory for the class (cleaned up by pytest)."""
+        cls.temp_dir = str(tmp_path_factory.mktemp("ffmpeg_wrapper"))
+    
     def setup_method(self):
         """Setup test fixtures."""
+        # Reuses the process-wide find_ffmpeg result
         self.ffmpeg_wrapper = FFmpegWrapper()
-        self.temp_dir = tempfile.mkdtemp()
     
-    def teardown_method(self):
-        """Cleanup test fixtures."""
-        import shutil
-        shutil.rmtree(self.temp_dir, ignore_errors=True)
+    @pytest.fixture
+    def uncached_lookup(self):
+        """Run a lookup test that patches shutil.which against a cold cache."""
+        find_ffmpeg.cache_clear()
+        yield
+        find_ffmpeg.cache_clear()
     
-    @patch('shutil.which')
-    def test_find_ffmpeg_in_path(self, mock_which):
+    @pytest.mark.usefixtures("uncached_lookup")
+    def test_find_ffmpeg_in_path(self, monkeypatch):
         """Test finding FFmpeg in system PATH."""
-        mock_which.return_value = '/usr/local/bin/ffmpeg'
+        monkeypatch.setattr(shutil, 'which', lambda cmd: '/usr/local/bin/ffmpeg')
         
         wrapper = FFmpegWrapper()
         assert wrapper.ffmpeg_path == 'ffmpeg'  # Should use 'ffmpeg' from PATH
     
-    @patch('shutil.which')
-    @patch('pathlib.Path.exists')
-    def test_find_ffmpeg_in_common_locations(self, mock_exists, mock_which):
+    @pytest.mark.usefixtures("uncached_lookup")
+    def test_find_ffmpeg_in_common_locations(self, monkeypatch):
         """Test finding FFmpeg in common locations."""
-        mock_which.return_value = None  # Not in PATH
-        mock_exists.return_value = True
+        monkeypatch.setattr(shutil, 'which', lambda cmd: None)  # Not in PATH
+        monkeypatch.setattr(Path, 'exists', lambda path: True)
+        monkeypatch.setattr(os, 'access', lambda path, mode: True)
         
         wrapper = FFmpegWrapper()
         # Should find FFmpeg in one of the common locations
         assert wrapper.ffmpeg_path in ['/usr/local/bin/ffmpeg', '/opt/homebrew/bin/ffmpeg']
     
-    @patch('shutil.which')
-    def test_ffmpeg_not_found(self, mock_which):
+    @pytest.mark.usefixtures("uncached_lookup")
+    def test_ffmpeg_not_found(self, monkeypatch):
         """Test FFmpeg not found error."""
-        mock_which.return_value = None
+        monkeypatch.setattr(shutil, 'which', lambda cmd: None)
         
         with pytest.raises(FFmpegNotFoundError):
             FFmpegWrapper()
@@ -211,25 +436,116 @@ class TestFFmpegWrapper:
         assert '192k' in cmd[cmd.index('-ab') + 1]
         assert output_path in cmd
 
+    def test_build_ffmpeg_command_stream_copy(self):
+        """Test MP3 source audio is copied instead of re-encoded."""
+        media_info = {
+            'audio_codec': 'mp3', 'bitrate': '192', 'channels': 2, 'sample_rate': '44100'
+        }
+
+        cmd = self.ffmpeg_wrapper._build_ffmpeg_command(
+            "/input/video.mp4", "/output/audio.mp3", {'bitrate': '192'}, media_info
+        )
+        assert cmd[cmd.index('-c:a') + 1] == 'copy'
+        assert 'libmp3lame' not in cmd
+
+        cmd = self.ffmpeg_wrapper._build_ffmpeg_command(
+            "/input/video.mp4", "/output/audio.mp3", {'bitrate': '320'}, media_info
+        )
+        assert '-c:a' not in cmd
+        assert 'libmp3lame' in cmd
+
+    def test_build_ffmpeg_command_with_template(self):
+        """Test a precompiled command template gives the same command."""
+        options = {'bitrate': '320', 'preserve_metadata': True, 'fade_in': 2}
+        expected = self.ffmpeg_wrapper._build_ffmpeg_command(
+            "/input/video.mp4", "/output/audio.mp3", options, {}
+        )
+
+        options['command_template'] = self.ffmpeg_wrapper.compile_command_template(options)
+        cmd = self.ffmpeg_wrapper._build_ffmpeg_command(
+            "/input/video.mp4", "/output/audio.mp3", options, {}
+        )
+        assert cmd == expected
+        assert cmd[-1] == "/output/audio.mp3"
+
+    def test_build_ffmpeg_command_single_filter_chain(self):
+        """Test normalization and fades share a single -af chain."""
+        options = {'volume_normalization': True, 'fade_in': 2}
+
+        cmd = self.ffmpeg_wrapper._build_ffmpeg_command(
+            "/input/video.mp4", "/output/audio.mp3", options, {}
+        )
+        assert cmd.count('-af') == 1
+        assert cmd[cmd.index('-af') + 1] == "loudnorm,afade=t=in:st=0:d=2"
+
+    @patch('subprocess.Popen')
+    def test_run_ffmpeg_with_progress_parses_progress(self, mock_popen):
+        """Test progress is computed from FFmpeg's -progress output."""
+        process = mock_popen.return_value
+        process.stdout = iter([
+            b"out_time_us=N/A\n",
+            b"out_time_us=2500000\n",
+            b"progress=continue\n",
+            b"out_time_us=10000000\n",
+            b"progress=end\n",
+        ])
+        process.wait.return_value = 0
+
+        progress_updates = []
+        success = self.ffmpeg_wrapper._run_ffmpeg_with_progress(
+            ['ffmpeg'], progress_updates.append, duration=10.0
+        )
+
+        assert success is True
+        assert progress_updates == [25, 100]
+    
+    @patch('subprocess.Popen')
+    def test_run_ffmpeg_with_progress_cancels_without_duration(self, mock_popen):
+        """Test cancellation is checked on every block, even with no progress to report."""
+        process = mock_popen.return_value
+        process.stdout = iter([
+            b"out_time_us=1000000\n",
+            b"progress=continue\n",
+            b"out_time_us=2000000\n",
+            b"progress=continue\n",
+        ])
+        checks = []
+        
+        def cancel():
+            checks.append(True)
+            return len(checks) == 2
+        
+        with pytest.raises(ConversionCancelledError):
+            self.ffmpeg_wrapper._run_ffmpeg_with_progress(
+                ['ffmpeg'], Mock(), duration=None, cancel=cancel
+            )
+        
+        assert len(checks) == 2
+        process.terminate.assert_called_once()
+
+    @patch('subprocess.run')
+    def test_get_video_duration_from_header(self, mock_run):
+        """Test duration is parsed from the FFmpeg header and cached."""
+        test_file = os.path.join(self.temp_dir, "video.mp4")
+        Path(test_file).touch()
+        mock_run.return_value = Mock(
+            returncode=1,
+            stderr="  Duration: 00:01:02.50, start: 0.000000, bitrate: 306 kb/s\n"
+        )
+
+        assert self.ffmpeg_wrapper._get_video_duration(test_file) == 62.5
+        assert self.ffmpeg_wrapper._get_video_duration(test_file) == 62.5
+        mock_run.assert_called_once()
+
 
 class TestConversionManager:
     """Test ConversionManager class."""
     
     def setup_method(self):
         """Setup test fixtures."""
-        self.settings = Mock()
-        self.settings.get.side_effect = lambda key, default=None: {
-            'audio_quality': '192',
-            'max_concurrent_conversions': 4,
-            'output_directory': '/tmp/output',
-            'file_naming_pattern': '{original}_converted',
-            'output_suffix': '_converted',
-            'preserve_metadata': True,
-            'volume_normalization': False,
-            'delete_original': False,
-        }.get(key, default)
+        self.settings = _StubSettings(_SETTINGS_MAP)
         
-        self.conversion_manager = ConversionManager(self.settings)
+        self.conversion_manager = ConversionManager()
     
     def test_start_conversion_with_no_files(self):
         """Test starting conversion with no files."""
@@ -237,11 +553,29 @@ class TestConversionManager:
             lambda msg: setattr(self, 'error_message', msg)
         )
         
-        self.conversion_manager.start_conversion([])
+        self.conversion_manager.start_conversion([], snapshot_settings(self.settings))
         
         assert hasattr(self, 'error_message')
         assert self.error_message == "変換するファイルがありません"
     
+    def test_start_conversion_rejects_batch_without_disk_space(self):
+        """Test the whole batch is rejected when it does not fit on disk."""
+        errors = []
+        started = []
+        self.conversion_manager.conversion_error.connect(errors.append)
+        self.conversion_manager.conversion_started.connect(started.append)
+        
+        with patch.object(self.conversion_manager.ffmpeg_wrapper, 'precheck_batch',
+                          side_effect=DiskSpaceError("Insufficient disk space")):
+            self.conversion_manager.start_conversion(
+                [{'input_path': '/input/file1.mp4', 'output_name': 'file1.mp4'}],
+                snapshot_settings(self.settings)
+            )
+        
+        assert errors == ["保存先に十分な空き容量がありません"]
+        assert started == []
+        assert not self.conversion_manager.is_converting()
+    
     def test_conversion_progress_tracking(self):
         """Test conversion progress tracking."""
         files = [
@@ -263,7 +597,7 @@ class TestConversionManager:
         
         # Mock the conversion to simulate progress
         with patch.object(self.conversion_manager, '_convert_single_file'):
-            self.conversion_manager.start_conversion(files)
+            self.conversion_manager.start_conversion(files, snapshot_settings(self.settings))
             
             # Simulate some progress
             self.conversion_manager._on_worker_progress('file1.mp4', 50)
@@ -274,18 +608,95 @@ class TestConversionManager:
         assert len(progress_updates) > 0
         assert any(update['file_name'] == 'file1.mp4' for update in progress_updates)
     
+    def test_progress_updates_are_coalesced(self):
+        """Test only the latest progress per file is emitted on flush."""
+        progress_updates = []
+        self.conversion_manager.conversion_progress.connect(
+            lambda file_name, progress, current, total: progress_updates.append((file_name, progress))
+        )
+        
+        self.conversion_manager._on_worker_progress('file1.mp4', 10)
+        self.conversion_manager._on_worker_progress('file1.mp4', 20)
+        self.conversion_manager._on_worker_progress('file2.mp4', 5)
+        self.conversion_manager._flush_progress()
+        
+        assert progress_updates == [('file1.mp4', 20), ('file2.mp4', 5)]
+    
     def test_cancel_conversion(self):
         """Test conversion cancellation."""
         files = [
             {'input_path': '/input/file1.mp4', 'name': 'file1.mp4'},
         ]
         
-        self.conversion_manager.start_conversion(files)
-        assert self.conversion_manager.converting is True
-        
-        self.conversion_manager.cancel_conversion()
-        assert self.conversion_manager.cancelled is True
-        assert self.conversion_manager.converting is False
+        with patch.object(self.conversion_manager, '_convert_single_file') as convert:
+            self.conversion_manager.start_conversion(files, snapshot_settings(self.settings))
+            assert self.conversion_manager.converting is True
+            
+            self.conversion_manager.cancel_conversion()
+            assert self.conversion_manager.cancelled is True
+            # The queued file has not reported in yet
+            assert self.conversion_manager.converting is True
+            
+            self.conversion_manager.start_conversion(files, snapshot_settings(self.settings))
+            assert convert.call_count == 1
+            
+            self.conversion_manager._on_worker_completed('file1.mp4', False, 'キャンセルされました')
+            assert self.conversion_manager.converting is False
+    
+    def test_tasks_keep_their_batch_state(self):
+        """Test queued tasks get the cancel event and settings of their own batch."""
+        files = [{'input_path': '/input/file1.mp4', 'name': 'file1.mp4'}]
+        
+        with patch.object(self.conversion_manager, '_convert_single_file') as convert:
+            self.conversion_manager.start_conversion(files, snapshot_settings(self.settings))
+            self.conversion_manager.cancel_conversion()
+            self.conversion_manager._on_worker_completed('file1.mp4', False, 'キャンセルされました')
+            
+            self.settings['audio_quality'] = '320'
+            self.conversion_manager.start_conversion(files, snapshot_settings(self.settings))
+        
+        (_, first_event, first_snapshot, first_options), _ = convert.call_args_list[0]
+        (_, second_event, _, second_options), _ = convert.call_args_list[1]
+        assert first_event.is_set()
+        assert not second_event.is_set()
+        assert first_snapshot['audio_quality'] == '192'
+        assert first_options['bitrate'] == '192'
+        assert second_options['bitrate'] == '320'
+    
+    def test_shutdown_waits_for_tasks_and_deletions(self):
+        """Test shutdown stops the running tasks and deletes queued originals."""
+        files = [{'input_path': '/input/file1.mp4', 'name': 'file1.mp4'}]
+        finished = []
+        
+        def convert(file_info, cancel_event, settings_snapshot, options):
+            # Runs until cancelled, like an FFmpeg process
+            finished.append(cancel_event.wait(timeout=5))
+        
+        with patch.object(self.conversion_manager, '_convert_single_file', side_effect=convert), \
+             patch.object(self.conversion_manager, '_delete_originals') as delete:
+            self.conversion_manager.start_conversion(files, snapshot_settings(self.settings))
+            self.conversion_manager._queue_deletion('/input/file0.mp4')
+            self.conversion_manager.shutdown()
+        
+        assert finished == [True]
+        delete.assert_called_once_with(['/input/file0.mp4'])
+    
+    def test_delete_originals_to_trash_logs_summary(self):
+        """Test trashed originals are logged as one summary line."""
+        logger = Mock()
+        self.conversion_manager.set_logger(logger)
+        
+        def trash(path):
+            if path == '/input/locked.mp4':
+                raise OSError("Permission denied")
+        
+        with patch('converter.conversion_manager.send2trash', side_effect=trash):
+            self.conversion_manager._delete_originals(
+                ['/input/file1.mp4', '/input/locked.mp4', '/input/file2.mp4']
+            )
+        
+        logger.info.assert_called_once_with("Deleted %d files (%d failed)", 2, 1)
+        logger.warning.assert_not_called()
 
 
 class TestConversionWorker:
@@ -293,21 +704,13 @@ class TestConversionWorker:
     
     def setup_method(self):
         """Setup test fixtures."""
-        self.settings = Mock()
-        self.settings.get.side_effect = lambda key, default=None: {
-            'audio_quality': '192',
-            'output_directory': '/tmp/output',
-            'file_naming_pattern': '{original}_converted',
-            'output_suffix': '_converted',
-            'preserve_metadata': True,
-            'volume_normalization': False,
-            'delete_original': False,
-        }.get(key, default)
+        self.settings = _StubSettings(_SETTINGS_MAP)
         
         self.ffmpeg_wrapper = Mock()
         self.file_info = {
             'input_path': '/input/test.mp4',
-            'name': 'test.mp4'
+            'name': 'test.mp4',
+            'output_filename': 'test_converted.mp3',
         }
         
         self.worker = ConversionWorker(self.file_info, self.settings, self.ffmpeg_wrapper)
@@ -324,14 +727,8 @@ class TestConversionWorker:
         self.worker.cancel()
         assert self.worker.cancelled is True
     
-    @patch('converter.conversion_manager.FileManager')
-    def test_worker_run_success(self, mock_file_manager_class):
+    def test_worker_run_success(self):
         """Test successful worker execution."""
-        # Mock FileManager
-        mock_file_manager = Mock()
-        mock_file_manager_class.return_value = mock_file_manager
-        mock_file_manager.generate_output_filename.return_value = "test_converted.mp3"
-        
         # Mock FFmpeg wrapper
         self.ffmpeg_wrapper.convert_mp4_to_mp3.return_value = True
         
@@ -359,52 +756,118 @@ class TestConversionWorker:
         assert completion_results[0][1] is True  # success
         assert completion_results[0][2] == "変換完了"  # message
 
+    def test_worker_defers_original_deletion(self):
+        """Test originals are handed to the delete callback, not removed."""
+        self.ffmpeg_wrapper.convert_mp4_to_mp3.return_value = True
+        settings = {
+            'output_directory': '/tmp/output',
+            'delete_original': True,
+        }
+        file_info = {
+            'input_path': '/input/test.mp4',
+            'output_name': 'test.mp4',
+            'output_filename': 'test_converted.mp3',
+        }
+        deleted = []
 
-class TestIntegration:
-    """Integration tests for the complete application."""
+        worker = ConversionWorker(
+            file_info, settings, self.ffmpeg_wrapper, delete_file=deleted.append
+        )
+        with patch('os.remove') as mock_remove:
+            worker.run()
+
+        assert deleted == ['/input/test.mp4']
+        mock_remove.assert_not_called()
+
+
+class TestFileListModel:
+    """Test FileListModel class."""
     
     def setup_method(self):
         """Setup test fixtures."""
-        self.temp_dir = tempfile.mkdtemp()
-        self.settings = Settings()
-        self.file_manager = FileManager()
-        self.logger = setup_logger("test")
+        self.model = FileListModel()
+        self.model.append_files([
+            {'path': f'/input/file{i}.mp4', 'name': f'file{i}.mp4', 'size_mb': 1.0}
+            for i in range(4)
+        ])
+    
+    def test_progress_and_status_updates(self):
+        """Test progress and completion update only the matching row."""
+        changed = []
+        self.model.dataChanged.connect(lambda first, last, roles: changed.append(first.row()))
+        
+        self.model.set_progress('file1.mp4', 40)
+        self.model.set_progress('file1.mp4', 40)  # unchanged, not repainted
+        self.model.set_conversion_status('file2.mp4', False, "変換失敗")
+        
+        assert changed == [1, 2]
+        assert self.model.index(1).data(ProgressRole) == 40
+        assert self.model.index(1).data(StatusRole) == STATUS_CONVERTING
+        assert self.model.index(2).data(StatusRole) == STATUS_FAILED
+    
+    def test_remove_rows(self):
+        """Test removing rows keeps the remaining files in order."""
+        self.model.remove_rows([3, 0, 1])
         
-        self.file_manager.set_logger(self.logger)
+        assert self.model.rowCount() == 1
+        assert self.model.files_to_convert() == [
+            {'input_path': '/input/file2.mp4', 'output_name': 'file2.mp4'}
+        ]
+        assert self.model.row_for_name('file2.mp4') == 0
+        assert self.model.row_for_name('file0.mp4') == -1
+        assert self.model.row_for_path('/input/file2.mp4') == 0
+        assert self.model.row_for_path('/input/file3.mp4') == -1
+
+
+class TestIntegration:
+    """Integration tests for the complete application."""
     
-    def teardown_method(self):
-        """Cleanup test fixtures."""
-        import shutil
-        shutil.rmtree(self.temp_dir, ignore_errors=True)
+    @pytest.fixture(scope="class", autouse=True)
+    @classmethod
+    def class_temp_dir(cls, tmp_path_factory):
+        """Create one temporary directory for the class (cleaned up by pytest)."""
+        cls.temp_dir = str(tmp_path_factory.mktemp("integration"))
+    
+    @pytest.fixture(scope="class", autouse=True)
+    @classmethod
+    def class_app_stack(cls, app_stack):
+        """Share the package's application objects with the class."""
+        cls.settings, cls.file_manager, cls.logger = app_stack
     
     def test_end_to_end_conversion_workflow(self):
         """Test complete conversion workflow."""
-        # Create a test MP4 file (empty file for testing)
+        # Create a test MP4 file (sparse, at the minimum accepted size)
         test_mp4 = os.path.join(self.temp_dir, "test_video.mp4")
-        Path(test_mp4).touch()
+        fd = os.open(test_mp4, os.O_CREAT | os.O_WRONLY, 0o600)
+        os.ftruncate(fd, 1024)
+        os.close(fd)
         
-        # Set up settings
+        # Set up settings, restored afterwards as they are shared
         output_dir = os.path.join(self.temp_dir, "output")
         os.makedirs(output_dir, exist_ok=True)
-        self.settings.set('output_directory', output_dir)
-        self.settings.set('audio_quality', '192')
-        
-        # Validate file
-        valid_files, invalid_files = self.file_manager.validate_input_files([test_mp4])
-        assert len(valid_files) == 1
-        assert len(invalid_files) == 0
-        
-        # Generate output filename
-        naming_pattern = self.settings.get('file_naming_pattern')
-        suffix = self.settings.get('output_suffix')
-        output_filename = self.file_manager.generate_output_filename(
-            test_mp4, naming_pattern, suffix
-        )
-        assert output_filename == "test_video_converted.mp3"
-        
-        # Check output path
-        expected_output = os.path.join(output_dir, output_filename)
-        assert expected_output.endswith(".mp3")
+        orig = self.settings.get_many(['output_directory', 'audio_quality'])
+        try:
+            self.settings.set('output_directory', output_dir)
+            self.settings.set('audio_quality', '192')
+            
+            # Validate file
+            valid_files, invalid_files = self.file_manager.validate_input_files([test_mp4])
+            assert len(valid_files) == 1
+            assert len(invalid_files) == 0
+            
+            # Generate output filename
+            naming_pattern = self.settings.get('file_naming_pattern')
+            suffix = self.settings.get('output_suffix')
+            output_filename = self.file_manager.generate_output_filename(
+                test_mp4, naming_pattern, suffix
+            )
+            assert output_filename == "test_video_converted.mp3"
+            
+            # Check output path
+            expected_output = os.path.join(output_dir, output_filename)
+            assert expected_output.endswith(".mp3")
+        finally:
+            self.settings.set_many(orig)
 
 
 if __name__ == "__main__":